@@ -0,0 +1,253 @@
+# Renders every scene in sequence.toml in draft quality and tracks the cost
+#
+#   python bench_renders.py run        # render, append to the history
+#   python bench_renders.py save       # ... and store the results as baseline
+#   python bench_renders.py compare    # ... and flag regressions vs baseline
+#   python bench_renders.py typecheck  # time every scene with and without beartype
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from statistics import median
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import toml
+from beartype import beartype
+
+from render_chapters import SceneJob, get_jobs
+
+PROFILE = "draft"
+HISTORY = Path("benchmarks", "render_history.jsonl")
+BASELINE = Path("benchmarks", "render_baseline.json")
+THRESHOLD = 0.25  # Relative increase of wall time reported as a regression
+REPEAT = 3  # Renders of each scene per setting in typecheck
+METRICS = ["wall", "max_rss", "frames", "bytes"]
+
+# cold: every render starts from empty jxpr (snapshots, glyphs, configs) and
+# manim Tex/text caches. warm: renders use the caches left by a first,
+# untimed render.
+CACHE_STATES = ["cold", "warm"]
+
+
+@beartype
+def count_frames(video: str) -> Optional[int]:
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0", "-count_packets",
+                "-show_entries", "stream=nb_read_packets", "-of", "csv=p=0", video,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return int(result.stdout.strip())
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def empty_caches():
+    """
+    Yields the extra manim arguments and environment of a render with empty
+    caches, kept in a temporary directory rather than clearing the real ones.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = Path(tmp, "manim.cfg")
+        cfg.write_text(
+            f"[CLI]\ntex_dir = {Path(tmp, 'Tex')}\ntext_dir = {Path(tmp, 'texts')}\n",
+            encoding="utf-8",
+        )
+        yield ["--config_file", str(cfg)], {"JXPR_CACHE_DIR": str(Path(tmp, "jxpr"))}
+
+
+@beartype
+def render_once(job: SceneJob, base_dir: str, cache: str = "cold", **env: str) -> dict:
+    """
+    Renders the scene without manim's partial movie cache, returning its
+    wall time (s), peak RSS (MiB), frame count and video size (bytes).
+    cache is one of CACHE_STATES, env adds environment variables, e.g.
+    JXPR_TYPECHECK.
+    """
+    if cache == "cold":
+        with empty_caches() as (args, cache_env):
+            return run_render(job, base_dir, args, dict(env, **cache_env))
+    elif cache == "warm":
+        run_render(job, base_dir, [], env)
+        return run_render(job, base_dir, [], env)
+    raise ValueError(f"Unsupported cache state {cache}, use cold or warm")
+
+
+@beartype
+def run_render(job: SceneJob, base_dir: str, args: List[str], env: dict) -> dict:
+    env = dict(os.environ, JXPR_PROFILE=job.profile, **env)
+    with tempfile.TemporaryFile() as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            job.command() + ["--disable_caching", *args],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+        # Resource usage of this child alone, unlike getrusage(RUSAGE_CHILDREN)
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            log.seek(0)
+            raise RuntimeError(f"{job.scene} failed:\n{log.read().decode()}")
+
+    output = job.output(base_dir)
+    return {
+        "wall": wall,
+        "max_rss": usage.ru_maxrss / 1024,  # KiB on Linux
+        "frames": count_frames(output),
+        "bytes": os.path.getsize(output),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@beartype
+def compare(
+    results: Dict[str, dict], baseline: Dict[str, dict], threshold: float = THRESHOLD
+) -> List[str]:
+    """
+    Prints the per-scene deltas against the baseline and returns the scenes
+    whose wall time grew by more than threshold.
+    """
+    print(f"{'scene':<48}" + "".join(f"{m:>18}" for m in METRICS))
+    regressions = []
+    for scene, result in results.items():
+        base = baseline.get(scene)
+        cells = []
+        for m in METRICS:
+            if result[m] is None:
+                cells.append(f"{'-':>18}")
+            elif base is None or not base.get(m):
+                cells.append(f"{result[m]:>18.1f}")
+            else:
+                cells.append(f"{result[m]:>10.1f} {result[m] / base[m] - 1:>+6.0%}")
+        slower = base is not None and result["wall"] > (1 + threshold) * base["wall"]
+        print(f"{scene:<48}" + "".join(cells) + ("  REGRESSION" if slower else ""))
+        if slower:
+            regressions.append(scene)
+
+    return regressions
+
+
+@beartype
+def typecheck_overhead(
+    jobs: List[SceneJob], base_dir: str, cache: str = "cold", repeat: int = REPEAT
+) -> Dict[str, dict]:
+    """
+    Renders every scene repeat times with and without the beartype checks
+    (see jxprcheck), alternating which goes first so that neither always
+    runs on the caches or page cache the other left, and prints the median
+    wall time the checks cost.
+    """
+    print(f"{'scene':<48}{'checked':>12}{'unchecked':>12}{'saved':>12}")
+    results = {}
+    for job in jobs:
+        name = f"{job.chapter}.{job.scene}"
+        walls = {"1": [], "0": []}
+        for i in range(repeat):
+            for setting in ("1", "0") if i % 2 == 0 else ("0", "1"):
+                walls[setting].append(
+                    render_once(job, base_dir, cache, JXPR_TYPECHECK=setting)["wall"]
+                )
+        checked, unchecked = median(walls["1"]), median(walls["0"])
+        results[name] = {"checked": checked, "unchecked": unchecked}
+        saved = checked - unchecked
+        print(
+            f"{name:<48}{checked:>11.1f}s{unchecked:>11.1f}s"
+            f"{saved:>8.1f}s {saved / checked:>+4.0%}",
+            flush=True,
+        )
+
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time draft renders of the scenes in sequence.toml"
+    )
+    parser.add_argument("command", choices=["run", "save", "compare", "typecheck"])
+    parser.add_argument("--sequence", default="sequence.toml")
+    parser.add_argument("--chapters", nargs="+", default=[])
+    parser.add_argument("--profile", default=PROFILE)
+    parser.add_argument("--cache", choices=CACHE_STATES, default="cold")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--history", type=Path, default=HISTORY)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    seq = toml.load(args.sequence)
+    quality = toml.load("defaults.toml")["profiles"][args.profile].get(
+        "quality", seq["configs"].get("quality", "480p15")
+    )
+
+    jobs = get_jobs(seq, quality, args.chapters, args.profile)
+    if args.command == "typecheck":
+        typecheck_overhead(jobs, seq["configs"]["base_dir"], args.cache, args.repeat)
+        sys.exit()
+    if args.command == "compare" and not args.baseline.exists():
+        sys.exit(f"No baseline at {args.baseline}, run `save` first")
+
+    results = {}
+    for job in jobs:
+        name = f"{job.chapter}.{job.scene}"
+        results[name] = render_once(job, seq["configs"]["base_dir"], args.cache)
+        print(f"[rendered] {name} in {results[name]['wall']:.1f}s", flush=True)
+
+    run = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "profile": args.profile,
+        "quality": quality,
+        "cache": args.cache,
+        "results": results,
+    }
+
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+
+    if args.command == "save":
+        args.baseline.write_text(json.dumps(run, indent=2), encoding="utf-8")
+        print(f"Saved the baseline to {args.baseline}")
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print(f"\nCompared with {baseline['commit']} ({baseline['date']})")
+        if baseline.get("cache") != args.cache:
+            state = baseline.get("cache", "unknown")
+            print(f"Warning: the baseline was rendered with {state} caches")
+
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if args.command == "compare" and regressions:
+        sys.exit(f"{len(regressions)} scene(s) regressed: " + ", ".join(regressions))
@@ -0,0 +1,281 @@
+# Micro benchmarks of the jxpr building blocks on synthetic n x n matrices
+#
+#   python jxprbench.py run                  # print timings
+#   python jxprbench.py save                 # store them as the baseline
+#   python jxprbench.py compare              # flag regressions vs the baseline
+
+import argparse
+import json
+import platform
+import re
+import sys
+import timeit
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from beartype import beartype
+from manim import __version__ as MANIM_VERSION
+
+from jxprlib import TERMS_CACHE, get_terms, get_verb
+from jxprmgr import JExpressionManager
+from jxprutils import make_circummat, vgroup
+
+SIZES = [1, 2, 5, 10, 20, 50]
+BASELINE = Path("benchmarks", "baseline.json")
+THRESHOLD = 0.25  # Relative slowdown reported as a regression
+MIN_TIME = 0.2  # Seconds per timing run, see timeit.Timer.autorange
+REPEAT = 5
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """
+    Registers a benchmark: a function of the matrix size n doing the setup,
+    and returning the call to time.
+    """
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+@beartype
+def synthetic_matrix(n: int) -> List[List[str]]:
+    return [[str(i * n + j) for j in range(n)] for i in range(n)]
+
+
+def synthetic_lib(n: int) -> dict:
+    matrix = synthetic_matrix(n)
+    return {
+        "verb": {"plus": "+"},
+        "matrices": {
+            "Bench": {f"Size{n}": [{"x": matrix, "y": matrix, "verb": "plus"}]}
+        },
+    }
+
+
+def synthetic_expr(n: int) -> JExpressionManager:
+    matrix = synthetic_matrix(n)
+    return JExpressionManager(
+        {
+            "x": make_circummat(matrix),
+            "verb": get_verb("plus"),
+            "y": make_circummat(matrix),
+        }
+    )
+
+
+@benchmark("make_circummat")
+def bench_make_circummat(n):
+    matrix = synthetic_matrix(n)
+    return lambda: make_circummat(matrix)
+
+
+@benchmark("make_circummat.compact")
+def bench_make_circummat_compact(n):
+    matrix = synthetic_matrix(n)
+    return lambda: make_circummat(matrix, compact=True)
+
+
+@benchmark("get_terms")
+def bench_get_terms(n):
+    lib = synthetic_lib(n)
+    get_terms("Bench", f"Size{n}", lib=lib)  # Cached from now on
+    return lambda: get_terms("Bench", f"Size{n}", lib=lib)
+
+
+@benchmark("get_terms.uncached")
+def bench_get_terms_uncached(n):
+    lib = synthetic_lib(n)
+
+    def run():
+        TERMS_CACHE.clear()
+        return get_terms("Bench", f"Size{n}", lib=lib)
+
+    return run
+
+
+@benchmark("CirumscribedJMatrix.set_property")
+def bench_mat_set_property(n):
+    mat = make_circummat(synthetic_matrix(n))
+    return lambda: mat.set_property("set_opacity", all=0.5, indices=range(0, n * n, 2))
+
+
+@benchmark("CirumscribedJMatrix.set_focus")
+def bench_mat_set_focus(n):
+    mat = make_circummat(synthetic_matrix(n))
+    # Walks the focus item by item as the scenes do, then off every item:
+    # set_focus only restyles what changed, so repeating a focus costs nothing
+    masks = [np.arange(n * n) == i for i in range(n * n)] + [np.zeros(n * n, bool)]
+    targets = cycle(masks)
+    return lambda: mat.set_focus(next(targets))
+
+
+@benchmark("CirumscribedJMatrix.align")
+def bench_mat_align(n):
+    mat = make_circummat(synthetic_matrix(n))
+    return lambda: mat.align("entries")
+
+
+@benchmark("JExpressionManager.set_property")
+def bench_mgr_set_property(n):
+    expr = synthetic_expr(n)
+    return lambda: expr.set_property("set_opacity", 0.5, subexpr=["x", "y"])
+
+
+@benchmark("JExpressionManager.style")
+def bench_mgr_style(n):
+    expr = synthetic_expr(n)
+    spec = {
+        "verb": {"opacity": 0.5},
+        ("x", "circumshapes"): {"opacity": 0},
+        ("y", "all", range(0, n * n, 2)): {"color": "#C55F73", "opacity": 0.5},
+    }
+    return lambda: expr.style(spec)
+
+
+@benchmark("JExpressionManager.jexpr")
+def bench_mgr_jexpr(n):
+    expr = synthetic_expr(n)
+    return lambda: (expr.jexpr.x, expr.jexpr.verb, expr.jexpr.y)
+
+
+@benchmark("JExpressionManager.regroup")
+def bench_mgr_regroup(n):
+    expr = synthetic_expr(n)
+    return lambda: expr.regroup().layout()  # The layout itself is lazy
+
+
+@benchmark("JExpressionManager.copy")
+def bench_mgr_copy(n):
+    expr = synthetic_expr(n)
+    return expr.copy
+
+
+@benchmark("vgroup")
+def bench_vgroup(n):
+    expr = synthetic_expr(n).jexpr
+    return lambda: vgroup(expr.x, expr.verb, expr.y)
+
+
+@beartype
+def time_call(
+    call: Callable, min_time: float = MIN_TIME, repeat: int = REPEAT
+) -> float:
+    """
+    Best time of a single call, over ``repeat`` runs of about min_time each.
+    """
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+@beartype
+def run(
+    sizes: List[int] = SIZES, pattern: str = "", min_time: float = MIN_TIME
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if not re.search(pattern, name):
+            continue
+        results[name] = {}
+        for n in sizes:
+            t = results[name][f"{n}x{n}"] = time_call(bench(n), min_time)
+            print(f"{name:<36}{f'{n}x{n}':>9}{t:>14.6f}s", flush=True)
+
+    return results
+
+
+@beartype
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = THRESHOLD,
+) -> List[str]:
+    """
+    Prints current against baseline times, returning the regressions, i.e.
+    the cases more than ``threshold`` slower than in the baseline.
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, t in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                print(f"{name:<36}{size:>9}{t:>14.6f}s  (no baseline)")
+                continue
+            change = t / base - 1
+            flag = "REGRESSION" if change > threshold else ""
+            print(f"{name:<36}{size:>9}{t:>14.6f}s {change:>+8.1%}  {flag}")
+            if flag:
+                regressions.append(f"{name} {size}")
+
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "manim": MANIM_VERSION,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the jxpr building blocks, headless"
+    )
+    parser.add_argument("command", choices=["run", "save", "compare"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--filter", default="", help="Regex on benchmark names")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--output", type=Path, help="Also write the results here")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run(args.sizes, args.filter, args.min_time)
+    data = {"environment": environment(), "results": results}
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    if args.command == "save":
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        print(f"Saved the baseline to {args.baseline}")
+
+    elif args.command == "compare":
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}, run `save` first")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline["environment"] != data["environment"]:
+            print(f"Baseline recorded on {baseline['environment']}")
+
+        print()
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s): " + ", ".join(regressions))
+
+        # A case without a baseline could not have been flagged above
+        missing = [
+            f"{name} {size}"
+            for name, sizes in results.items()
+            for size in sizes
+            if baseline["results"].get(name, {}).get(size) is None
+        ]
+        if missing:
+            sys.exit(
+                f"No baseline in {args.baseline} for {len(missing)} case(s), "
+                "run `save` to record them: " + ", ".join(missing)
+            )
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from types import FunctionType
+from typing import Callable, Hashable
+import numpy as np
+from jxprcheck import beartype
+from manim import Text, __version__ as MANIM_VERSION
+
+CACHE_DIR = Path(os.environ.get("JXPR_CACHE_DIR", ".jxpr_cache"))
+GLYPH_CACHE_SIZE = 512
+
+
+@beartype
+def cache_path(*parts: str) -> Path:
+    return CACHE_DIR.joinpath(*parts)
+
+
+@beartype
+def write_atomic(path: Path, data: bytes):
+    """
+    Writes via a temporary file so that concurrent render workers never see
+    a partially written cache entry.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=GLYPH_CACHE_SIZE)
+def load_glyph(text: str, config: tuple) -> Text:
+    """
+    Typesets ``text`` once per (text, font, font_size, color, ...) and keeps
+    it on disk under the hash of that key for every other process.
+    """
+    key = repr((MANIM_VERSION, text, config)).encode()
+    path = cache_path("glyphs", hashlib.sha256(key).hexdigest() + ".pickle")
+
+    if path.exists():
+        try:
+            return pickle.loads(path.read_bytes())
+        except Exception:
+            pass  # Unreadable entry, typeset again
+
+    glyph = Text(text, **dict(config))
+    try:
+        write_atomic(path, pickle.dumps(glyph, protocol=pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        pass
+
+    return glyph
+
+
+def cached_text(text: str, **kwargs) -> Text:
+    """
+    Drop-in for ``Text`` as ``element_to_mobject`` that hands out copies of
+    cached glyphs instead of typesetting identical entries again.
+    """
+    try:
+        return load_glyph(str(text), tuple(sorted(kwargs.items()))).copy()
+    except TypeError:  # Unhashable config, e.g. t2c dicts
+        return Text(text, **kwargs)
+
+
+def freeze(obj) -> Hashable:
+    """
+    Hashable form of (possibly nested) call arguments, for cache keys.
+    Functions are keyed by their code and closure so that the same lambda
+    created again on every call still hits, other objects by identity.
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        return ("ndarray", obj.shape, tuple(obj.ravel().tolist()))
+    if isinstance(obj, FunctionType):
+        cells = tuple(freeze(c.cell_contents) for c in obj.__closure__ or ())
+        return (obj.__code__, freeze(obj.__defaults__ or ()), cells)
+    try:
+        hash(obj)
+        return obj
+    except TypeError:
+        return ("id", id(obj))
+
+
+class MemoCache:
+    """
+    Bounded LRU of built values that counts its hits and misses.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key: Hashable, build: Callable):
+        if key in self.data:
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+
+        self.misses += 1
+        value = self.data[key] = build()
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        self.data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+        }
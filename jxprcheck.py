@@ -0,0 +1,35 @@
+# Runtime type checks, on unless a final render asks otherwise
+#
+# Modules used while rendering import beartype from here: with checks off
+# it returns the decorated functions unchanged, so they cost nothing.
+
+import os
+
+import toml
+from beartype import BeartypeConf, BeartypeStrategy
+from beartype import beartype as checked
+
+
+def typecheck_enabled(defaults: str = "defaults.toml") -> bool:
+    """
+    JXPR_TYPECHECK if set, else the typecheck setting of the JXPR_PROFILE
+    render profile (set by render_chapters.py). Checks stay on otherwise,
+    e.g. when a scene is rendered with manim directly.
+    """
+    env = os.environ.get("JXPR_TYPECHECK")
+    if env is not None:
+        return env.lower() not in ("0", "false", "no", "")
+
+    profile = os.environ.get("JXPR_PROFILE")
+    if not profile:
+        return True
+
+    # Plain toml rather than jxprconf, which imports manim
+    return toml.load(defaults)["profiles"][profile].get("typecheck", True)
+
+
+TYPECHECK = typecheck_enabled()
+
+beartype = (
+    checked if TYPECHECK else checked(conf=BeartypeConf(strategy=BeartypeStrategy.O0))
+)
@@ -0,0 +1,51 @@
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+import toml
+from box import Box
+from jxprcheck import beartype
+from jxprcache import cache_path, write_atomic
+
+
+@beartype
+def load_compiled(path: str) -> dict:
+    """
+    Parses a toml file, reusing its compiled (pickled) form as long as the
+    file's mtime, or failing that its content hash, is unchanged.
+    """
+    stat = os.stat(path)
+    location = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    compiled = cache_path("config", f"{Path(path).name}-{location}.pickle")
+
+    cached = None
+    if compiled.exists():
+        try:
+            cached = pickle.loads(compiled.read_bytes())
+        except Exception:
+            pass  # Unreadable cache, parse again
+
+    if cached is not None and cached["mtime"] == stat.st_mtime_ns:
+        return cached["data"]
+
+    content = Path(path).read_bytes()
+    sha = hashlib.sha256(content).hexdigest()
+    if cached is not None and cached["sha"] == sha:
+        data = cached["data"]
+    else:
+        data = toml.loads(content.decode("utf-8"))
+
+    cached = {"mtime": stat.st_mtime_ns, "sha": sha, "data": data}
+    write_atomic(compiled, pickle.dumps(cached, protocol=pickle.HIGHEST_PROTOCOL))
+
+    return data
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str) -> Box:
+    """
+    Read-only view of a toml config, built once per process and shared by
+    every module that loads the same file.
+    """
+    return Box(load_compiled(path), box_dots=True, frozen_box=True)
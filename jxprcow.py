@@ -0,0 +1,158 @@
+import copy
+import weakref
+import numpy as np
+from manim import Mobject
+
+# ndarray methods and NumPy functions writing into the array (the first
+# argument of the functions), besides item assignment and in-place ufuncs
+WRITING_METHODS = ["fill", "sort", "put", "partition", "setfield"]
+WRITING_FUNCTIONS = {
+    np.copyto, np.place, np.put, np.putmask, np.put_along_axis, np.fill_diagonal
+}
+
+
+class CowArray(np.ndarray):
+    """
+    Point/colour buffer shared between a mobject and its clones.
+
+    The first write through any of them (item assignment, in-place ufuncs
+    such as ``points += shift``, fill, np.copyto, ...) copies the buffer and
+    rebinds it on the writing mobject, so the others keep seeing the original
+    values. Shared buffers are read-only, so that a write missed here fails
+    instead of changing every mobject sharing the buffer.
+    """
+
+    _cow_shared = False
+    _cow_owner = None  # weakref to the mobject holding this array ...
+    _cow_attr = None  # ... under this attribute
+    _cow_parent = None  # array this one is a view of
+    _cow_detached = None  # private copy made by the first write
+
+    def __array_finalize__(self, obj):
+        # Views (e.g. points[:, 0]) stay shared with their parent
+        if getattr(obj, "_cow_shared", False) and np.may_share_memory(self, obj):
+            self._cow_shared = True
+            self._cow_parent = obj
+
+    def writable(self) -> np.ndarray:
+        """
+        Plain array to write into, detaching from the shared buffer first.
+        """
+        if not self._cow_shared:
+            return self.view(np.ndarray)
+        if self._cow_detached is not None:
+            return self._cow_detached
+
+        owner = self._cow_owner and self._cow_owner()
+        if owner is not None:
+            self._cow_detached = np.array(self)
+            if getattr(owner, self._cow_attr, None) is self:
+                setattr(owner, self._cow_attr, self._cow_detached)
+        elif self._cow_parent is not None and self._cow_parent.flags.c_contiguous:
+            base = self._cow_parent.writable()
+            offset = self.ctypes.data - self._cow_parent.ctypes.data
+            self._cow_detached = np.ndarray(
+                self.shape, self.dtype, buffer=base, offset=offset, strides=self.strides
+            )
+        else:  # Nothing to write back into, the write stays private
+            self._cow_detached = np.array(self)
+
+        return self._cow_detached
+
+    def __setitem__(self, key, value):
+        if type(value) is CowArray and value._cow_detached is not None:
+            value = value._cow_detached  # e.g. points[:, 0] *= 2 wrote there
+        self.writable()[key] = value
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func in WRITING_FUNCTIONS:
+            if args and isinstance(args[0], CowArray):
+                args = (args[0].writable(), *args[1:])
+            for k in ("dst", "a", "arr"):
+                if isinstance(kwargs.get(k), CowArray):
+                    kwargs = dict(kwargs, **{k: kwargs[k].writable()})
+        return super().__array_function__(func, types, args, kwargs)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        # Results are plain arrays, only the buffers held by mobjects are shared
+        inputs = [i.view(np.ndarray) if type(i) is CowArray else i for i in inputs]
+        if out is not None:
+            kwargs["out"] = tuple(
+                o.writable() if type(o) is CowArray else o for o in out
+            )
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+
+def writing_method(name: str):
+    def method(self, *args, **kwargs):
+        return getattr(self.writable(), name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+for name in WRITING_METHODS:
+    setattr(CowArray, name, writing_method(name))
+
+
+def share(array: np.ndarray, owner: Mobject, attr: str) -> CowArray:
+    shared = array.view(CowArray)
+    shared.flags.writeable = False
+    shared._cow_shared = True
+    shared._cow_owner = weakref.ref(owner)
+    shared._cow_attr = attr
+    return shared
+
+
+def mobject_arrays(obj, seen=None):
+    """
+    Yields (mobject, attribute, array) for the buffers of every mobject
+    reachable from obj through containers and jxpr objects.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, Mobject):
+        for mob in obj.get_family():
+            seen.add(id(mob))
+            for k, v in vars(mob).items():
+                if isinstance(v, np.ndarray):
+                    yield mob, k, v
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from mobject_arrays(v, seen)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from mobject_arrays(v, seen)
+    elif type(obj).__module__.startswith("jxpr") and hasattr(obj, "__dict__"):
+        for v in vars(obj).values():
+            yield from mobject_arrays(v, seen)
+
+
+def cow_copy(obj):
+    """
+    Structural clone of a mobject, CirumscribedJMatrix or JExpressionManager:
+    the mobject tree is copied but point and colour buffers are shared
+    (copy-on-write) instead of duplicated.
+    """
+    arrays = list(mobject_arrays(obj))
+
+    memo = {}
+    for mob, k, v in arrays:
+        shared = share(v, mob, k)
+        setattr(mob, k, shared)
+        memo[id(shared)] = v.view(CowArray)  # Owned once the clone exists
+
+    clone = copy.deepcopy(obj, memo)
+
+    for mob, _, _ in arrays:
+        clone_mob = memo.get(id(mob))
+        if clone_mob is None:
+            continue
+        for k, v in vars(clone_mob).items():
+            if isinstance(v, CowArray) and v._cow_owner is None:
+                setattr(clone_mob, k, share(v, clone_mob, k))
+
+    return clone
@@ -0,0 +1,135 @@
+import ast
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set
+
+import toml
+from jxprcheck import beartype
+
+
+@beartype
+def module_parts(path: str) -> dict:
+    """
+    Splits a module into its class definitions and the source of everything
+    else (imports, helpers, module level configs).
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    tree = ast.parse(source)
+    classes = {n.name: n for n in tree.body if isinstance(n, ast.ClassDef)}
+    imports = [
+        n.module for n in tree.body if isinstance(n, ast.ImportFrom) and n.module
+    ] + [a.name for n in tree.body if isinstance(n, ast.Import) for a in n.names]
+
+    toplevel = "\n".join(
+        ast.get_source_segment(source, n)
+        for n in tree.body
+        if not isinstance(n, ast.ClassDef)
+    )
+
+    return {"source": source, "classes": classes, "imports": imports, "toplevel": toplevel}
+
+
+@beartype
+def scene_classes(classes: Dict[str, ast.ClassDef], scene: str) -> List[str]:
+    """
+    Returns the scene and every class of the same module it depends on, i.e.
+    its bases and any class it refers to (e.g. a previous scene it sets up).
+    """
+    seen, pending = [], [scene]
+    while pending:
+        name = pending.pop()
+        if name in seen or name not in classes:
+            continue
+        seen.append(name)
+        pending += [
+            n.id for n in ast.walk(classes[name]) if isinstance(n, ast.Name)
+        ]
+
+    return sorted(seen)
+
+
+@beartype
+def local_sources(
+    imports: List[str], root: str, seen: Optional[Set[str]] = None
+) -> Dict[str, str]:
+    """
+    Sources of the modules of this project (jxprutils, jxprlib, ...) imported
+    by a scene module, followed transitively.
+    """
+    seen = set() if seen is None else seen
+    sources = {}
+    for module in imports:
+        path = os.path.join(root, module.replace(".", os.sep) + ".py")
+        if module in seen or not os.path.exists(path):
+            continue
+        seen.add(module)
+        parts = module_parts(path)
+        sources[module] = parts["source"]
+        sources |= local_sources(parts["imports"], root, seen)
+
+    return sources
+
+
+@beartype
+def scene_fingerprint(
+    module: str,
+    scene: str,
+    topic: str,
+    quality: str = "",
+    profile: str = "",
+    lib: str = "lib.toml",
+    defaults: str = "defaults.toml",
+) -> str:
+    """
+    Hash of everything a rendered scene depends on: the source of the scene
+    class and the classes it builds on, the lib.toml entries read by
+    get_terms for them, defaults.toml, the render quality and profile.
+    """
+    root = os.path.dirname(os.path.abspath(module))
+    parts = module_parts(module)
+    classes = scene_classes(parts["classes"], scene)
+
+    # Scenes may read the terms of another scene, e.g. scene="Quiz1Scene"
+    strings = {
+        n.value
+        for c in classes
+        for n in ast.walk(parts["classes"][c])
+        if isinstance(n, ast.Constant) and isinstance(n.value, str)
+    }
+
+    libdata = toml.load(lib)
+    matrices = libdata.get("matrices", {}).get(topic, {})
+
+    fingerprint = {
+        "classes": {c: ast.unparse(parts["classes"][c]) for c in classes},
+        "toplevel": parts["toplevel"],
+        "modules": local_sources(parts["imports"], root),
+        "matrices": {k: v for k, v in matrices.items() if k in classes or k in strings},
+        "lib": {k: v for k, v in libdata.items() if k != "matrices"},
+        "defaults": toml.load(defaults),
+        "quality": quality,
+        "profile": profile,
+    }
+
+    data = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+@beartype
+def load_manifest(path: str) -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@beartype
+def save_manifest(path: str, manifest: Dict[str, str]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
@@ -1,27 +1,45 @@
 from typing import Union, Callable
-import toml
 from box import Box
 from jxprutils import make_circummat, make_verb, make_equals
-from beartype import beartype
+from jxprrank import evaluate
+from jxprconf import load_config
+from jxprcache import MemoCache, freeze
+from jxprcheck import beartype
+
+LIB = load_config("lib.toml")
+
+TERMS_CACHE = MemoCache(maxsize=64)
 
-LIB = Box(toml.load("lib.toml"), frozen_box=True)
 
 @beartype
-def get_terms(
+def fill_result(entry: Union[dict, Box], lib: Union[dict, Box] = LIB) -> dict:
+    """
+    Computes x_plus_y from x, y and the entry's verb when it is not given.
+    """
+    entry = dict(entry)
+    if "x_plus_y" not in entry and "verb" in entry:
+        result = evaluate(lib["verb"][entry["verb"]], entry["x"], entry["y"])
+        if result is not None:
+            entry["x_plus_y"] = result
+
+    return entry
+
+
+def build_terms(
     topic: str,
     scene: str,
-    lib: Union[dict, Box] = LIB,
-    mobmatrix_args: Union[dict, Box] = {},
-    entries_filter: Callable = lambda x: x in ["x", "y", "x_plus_y"],
+    lib: Union[dict, Box],
+    mobmatrix_args: Union[dict, Box],
+    entries_filter: Callable,
 ):
-    lib = Box(lib)
-    
-    mobmatrix_args = Box(mobmatrix_args, default_box=True)
+    lib = lib if isinstance(lib, Box) else Box(lib)
+
     terms = []
     for t in lib.matrices[topic][scene]:
+        t = fill_result(t, lib)
         terms.append(
             {
-                k: make_circummat(v, **Box(mobmatrix_args[k], default_box=True))
+                k: make_circummat(v, **mobmatrix_args.get(k, {}))
                 for k, v in t.items()
                 if entries_filter(k)
             }
@@ -29,12 +47,39 @@ def get_terms(
 
     return terms
 
+
+@beartype
+def get_terms(
+    topic: str,
+    scene: str,
+    lib: Union[dict, Box] = LIB,
+    mobmatrix_args: Union[dict, Box] = {},
+    entries_filter: Callable = lambda x: x in ["x", "y", "x_plus_y"],
+):
+    """
+    Terms are built once per (topic, scene, lib, mobmatrix_args, filter) and
+    every call gets its own copies, see TERMS_CACHE.info() for hit rates.
+    """
+    key = (
+        topic,
+        scene,
+        "LIB" if lib is LIB else freeze(lib),
+        freeze(mobmatrix_args),
+        freeze(entries_filter),
+    )
+    terms = TERMS_CACHE.get(
+        key, lambda: build_terms(topic, scene, lib, mobmatrix_args, entries_filter)
+    )
+
+    return [{k: v.copy() for k, v in t.items()} for t in terms]
+
+
 @beartype
 def get_verb(entry: str, lib: Union[dict, Box] = LIB, **kwargs):
-    lib = Box(lib)  # Since Box(a) == Box(Box(a))
+    lib = lib if isinstance(lib, Box) else Box(lib)
     return make_verb(lib.verb[entry], **kwargs)
 
 @beartype
 def get_equals(entry: str, lib: Union[dict, Box] = LIB, **kwargs):
-    lib = Box(lib) # Since Box(a) == Box(Box(a))
+    lib = lib if isinstance(lib, Box) else Box(lib)
     return make_equals(lib.equals[entry], **kwargs)
@@ -1,31 +1,163 @@
 from tkinter import CENTER
 from xmlrpc.client import Boolean
 from manim import *
-from copy import deepcopy
-from typing import Union, Optional, Callable
-from beartype import beartype
-from collections.abc import Iterable
+from typing import Union, Optional, Callable, List
+from jxprcheck import beartype
+from collections.abc import Iterable, Sized
+import copy
+import numpy as np
+from jxprcow import cow_copy
+
+
+def bounds(mobjects) -> np.ndarray:
+    """
+    Bounding boxes of the mobjects as an (n, 2, 3) array of lower and upper
+    corners, gathered once (zeros without points, as in get_critical_point).
+    """
+    result = np.zeros((len(mobjects), 2, 3))
+    for i, mob in enumerate(mobjects):
+        points = mob.get_points_defining_boundary()
+        if len(points):
+            result[i] = points.min(axis=0), points.max(axis=0)
+    return result
+
+
+def edges(bounds: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    """
+    Critical points of the bounding boxes along direction, see
+    Mobject.get_critical_point.
+    """
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    return np.where(
+        direction < 0, lower, np.where(direction > 0, upper, (lower + upper) / 2)
+    )
+
+
+def stamp(template: Mobject, centers: np.ndarray) -> List[Mobject]:
+    """
+    Copies of template (which has no submobjects) centered on centers, whose
+    points are views into one buffer computed at once. Each copy has its own
+    style, and its own points once it is moved (Mobject.shift copies them).
+    """
+    points = template.points - template.get_center()
+    buffer = points[np.newaxis] + centers[:, np.newaxis]
+
+    shapes = []
+    for shape_points in buffer:
+        shape = copy.copy(template)
+        for k, v in vars(template).items():
+            if isinstance(v, (np.ndarray, list, dict)):
+                setattr(shape, k, v.copy())
+        shape.points = shape_points
+        shapes.append(shape)
+
+    return shapes
+
+
+PARTS = ("all", "items", "circumshapes")
+
+
+def restyle(
+    mob: Mobject,
+    color=None,
+    opacity: Optional[float] = None,
+    fill_opacity: Optional[float] = None,
+    stroke_width: Optional[float] = None,
+    scale: Optional[float] = None,
+) -> Mobject:
+    """
+    set_color, set_opacity (fill_opacity overriding it for the fill),
+    set_stroke(width=...) and scale at once, walking the family only once.
+    """
+    if scale is not None:
+        mob.scale(scale)
+
+    fill_opacity = opacity if fill_opacity is None else fill_opacity
+    for m in mob.get_family():
+        if not isinstance(m, VMobject):
+            if color is not None:
+                m.set_color(color, family=False)
+            if opacity is not None:
+                m.set_opacity(opacity, family=False)
+            continue
+        if color is not None or fill_opacity is not None:
+            m.set_fill(color, fill_opacity, family=False)
+        if color is not None or stroke_width is not None or opacity is not None:
+            m.set_stroke(color, stroke_width, opacity, family=False)
+        if opacity is not None:
+            m.set_stroke(opacity=opacity, background=True, family=False)
+
+    return mob
 
 
 class CirumscribedJMatrix:
     @beartype
-    def __init__(self, matrix: MobjectMatrix, get_items: str, circumshape: Mobject):
+    def __init__(
+        self,
+        matrix: MobjectMatrix,
+        get_items: str,
+        circumshape: Mobject,
+        compact: bool = False,
+    ):
+        """
+        compact stamps the circumshapes from a single point buffer (see stamp)
+        and adds them to the matrix as one group, rather than copying, moving
+        and grouping them with their item one at a time.
+        """
         self.matrix = matrix.copy()
         self.matrix_items = getattr(self.matrix, get_items)()
 
         self.nitems = len(self.matrix_items)
         itemnums = range(self.nitems)
 
-        self.circumshapes = circumshape
-        if not isinstance(circumshape, list):
-            self.circumshapes = [circumshape.copy() for _ in itemnums]
+        shared = not isinstance(circumshape, list) and not circumshape.submobjects
+        if compact and shared:
+            centers = edges(bounds(self.matrix_items), ORIGIN)
+            self.circumshapes = stamp(circumshape, centers)
+            # Items last, so they are still drawn over the circumshapes
+            self.matrix.add(VGroup(*self.circumshapes), VGroup(*self.matrix_items))
+        else:
+            self.circumshapes = circumshape
+            if not isinstance(circumshape, list):
+                self.circumshapes = [circumshape.copy() for _ in itemnums]
 
-        for i in itemnums:
-            self.circumshapes[i].move_to(self.matrix_items[i].get_center())
-            self.matrix.add(VGroup(self.circumshapes[i], self.matrix_items[i]))
+            for i in itemnums:
+                self.circumshapes[i].move_to(self.matrix_items[i].get_center())
+                self.matrix.add(VGroup(self.circumshapes[i], self.matrix_items[i]))
+
+        self.invalidate_focus()
 
     def copy(self):
-        return deepcopy(self)
+        return cow_copy(self)
+
+    @beartype
+    def select(
+        self, indices: Optional[Union[Iterable[int], np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Sorted numbers of the items picked by indices, either item numbers
+        (list, set, range, array, ...) or a boolean mask over the items.
+        None or an empty list, tuple, set or range picks every item.
+        """
+        if isinstance(indices, np.ndarray):
+            if indices.dtype == bool:
+                return np.flatnonzero(indices[: self.nitems])
+            selected = indices.astype(int).ravel()
+        elif indices is None or (isinstance(indices, Sized) and not len(indices)):
+            return np.arange(self.nitems)
+        elif isinstance(indices, range):
+            selected = np.arange(indices.start, indices.stop, indices.step)
+        else:
+            selected = np.fromiter(indices, dtype=int)
+        return np.unique(selected[(selected >= 0) & (selected < self.nitems)])
+
+    @beartype
+    def mask(
+        self, indices: Optional[Union[Iterable[int], np.ndarray]] = None
+    ) -> np.ndarray:
+        mask = np.zeros(self.nitems, dtype=bool)
+        mask[self.select(indices)] = True
+        return mask
 
     @beartype
     def set_property(
@@ -34,7 +166,7 @@ class CirumscribedJMatrix:
         all: Optional[Union[int, float, str]] = None,
         circumshapes: Optional[Union[int, float, str]] = None,
         items: Optional[Union[int, float, str]] = None,
-        indices: Optional[Iterable[int]] = None,
+        indices: Optional[Union[Iterable[int], np.ndarray]] = None,
         *args,
         **kwargs
     ):
@@ -42,10 +174,9 @@ class CirumscribedJMatrix:
         if all is not None:
             circumshapes = items = all
 
-        indexes = indices or range(self.nitems)
-        mics = [x for i, x in enumerate(iter(self)) if i in indexes]
-
-        for mi, cs in mics:
+        self.invalidate_focus()
+        for i in self.select(indices):
+            mi, cs = self.matrix_items[i], self.circumshapes[i]
             if circumshapes is not None:
                 getattr(cs, attr)(circumshapes, *args, **kwargs)
                 cs.set_fill(opacity=0)
@@ -54,6 +185,41 @@ class CirumscribedJMatrix:
 
         return self
 
+    @beartype
+    def style(self, spec: dict):
+        """
+        Applies all the properties (see restyle) in spec at once, in a single
+        pass per mobject. spec maps a part ("all", "items" or "circumshapes")
+        or a (part, indices) pair to properties:
+
+            x.style({"all": {"opacity": 0.1}, ("items", (0, 4)): {"color": RED}})
+
+        Keys with indices override those without, later keys earlier ones.
+        As with set_property, the circumshapes restyled are left unfilled.
+        """
+        styles = {}
+        # Stable, so later keys still win among equally specific ones
+        rules = sorted(spec.items(), key=lambda rule: not isinstance(rule[0], str))
+        for key, props in rules:
+            part, indices = (key, None) if isinstance(key, str) else key
+            if part not in PARTS:
+                raise ValueError(f"Unknown part {part}, use one of {PARTS}")
+
+            for i in self.select(indices):
+                if part != "circumshapes":
+                    styles.setdefault(("items", i), {}).update(props)
+                if part != "items":
+                    styles.setdefault(("circumshapes", i), {}).update(props)
+
+        self.invalidate_focus()
+        for (part, i), props in styles.items():
+            if part == "items":
+                restyle(self.matrix_items[i], **props)
+            else:
+                restyle(self.circumshapes[i], **{**props, "fill_opacity": 0})
+
+        return self
+
     def __getitem__(self, index):
         return (self.matrix_items[index], self.circumshapes[index])
 
@@ -70,38 +236,82 @@ class CirumscribedJMatrix:
         return self.set_property("scale", *args, **kwargs)
 
     @beartype
-    def set_focus(self, indices: Iterable[int], defocus: float = 0.1):
+    def set_focus(
+        self, indices: Union[Iterable[int], np.ndarray], defocus: float = 0.1
+    ):
+        """
+        Shows the indexed items at full opacity and the others at defocus.
+
+        Only the items whose focus changed since the previous set_focus are
+        restyled, unless the opacities were changed in between (through
+        set_property or animate, else call invalidate_focus).
+        """
+        focused = self.select(indices)
 
-        indexes = list(set(range(self.nitems)) - set(indices))
-        self.set_opacity(circumshapes=defocus, items=defocus, indices=indexes)
+        if self.__focus__ is not None and self.__focus__[1] == defocus:
+            gained = np.setdiff1d(focused, self.__focus__[0], assume_unique=True)
+            lost = np.setdiff1d(self.__focus__[0], focused, assume_unique=True)
+        else:
+            gained = focused
+            lost = np.setdiff1d(np.arange(self.nitems), focused, assume_unique=True)
 
-        self.set_opacity(circumshapes=1.0, items=1.0, indices=indices)
+        self.set_opacity(circumshapes=defocus, items=defocus, indices=lost)
+        self.set_opacity(circumshapes=1.0, items=1.0, indices=gained)
+
+        focused.flags.writeable = False
+        self.__focus__ = (focused, defocus, frozenset(focused.tolist()))
 
         return self
 
+    def invalidate_focus(self):
+        """
+        Forgets the focus set by set_focus, so the next one restyles every item.
+        """
+        self.__focus__ = None
+        return self
+
+    @property
+    def focused(self) -> Optional[np.ndarray]:
+        """
+        Sorted (read-only) numbers of the focused items, None when the focus
+        is not known, i.e. set_focus was not called since the last restyle.
+        """
+        return None if self.__focus__ is None else self.__focus__[0]
+
+    @beartype
+    def is_focused(self, index: int) -> bool:
+        return self.__focus__ is not None and index in self.__focus__[2]
+
     @beartype
-    def align(self, along="entries"):
+    def align(self, along: str = "entries"):
         """
-        Aligns all entries to the 0th item.
+        Aligns all entries to the 0th item: "entries" aligns the bottoms of
+        every row and the left of the first column, "rows" the left of the
+        first entries of the rows and "columns" the tops of the first row.
         """
-        items = self.matrix.get_columns() if along=="columns" else self.matrix.get_rows()         
-        mi, cs = self.matrix_items, self.circumshapes
+        nrows, ncols = len(self.matrix.mob_matrix), len(self.matrix.mob_matrix[0])
+        heads = np.arange(nrows) * ncols  # First entries of the rows
 
-        dir = LEFT if along=="rows" else UP 
-        for i, m in enumerate(items):
-            if along=="row" or along=="columns":
-                cs[i].align_to(cs[0], dir)
-                mi[i].align_to(mi[0], dir)
+        for mobs in [self.circumshapes, self.matrix_items]:
+            box = bounds(mobs)
+            shifts = np.zeros((len(mobs), 3))
+            if along == "columns":
+                top = edges(box, UP)[:, 1]
+                shifts[:ncols, 1] = top[0] - top[:ncols]
+            elif along == "rows":
+                left = edges(box, LEFT)[:, 0]
+                shifts[heads, 0] = left[0] - left[heads]
             else:
-                for j, _ in enumerate(m):
-                    cs[i * len(m) + j].align_to(cs[i * len(m)], DOWN)
-                    mi[i * len(m) + j].align_to(mi[i * len(m)], DOWN)
-
-                    # Align entries of first column
-                    if not j:
-                        cs[i * len(m) + j].align_to(cs[0], LEFT)
-                        mi[i * len(m) + j].align_to(mi[0])
-                        
+                bottom = edges(box, DOWN)[:, 1]
+                shifts[:, 1] = np.repeat(bottom[heads], ncols) - bottom
+                # Items keep their x, which align_to(mi[0]) never changed
+                if mobs is self.circumshapes:
+                    left = edges(box, LEFT)[:, 0]
+                    shifts[heads, 0] = left[0] - left[heads]
+
+            for i in np.flatnonzero(shifts.any(axis=1)):
+                mobs[i].shift(shifts[i])
+
         return self
 
     @beartype
@@ -110,7 +320,7 @@ class CirumscribedJMatrix:
         all: Optional[Union[Callable, Animation]] = None,
         items: Optional[Union[Callable, Animation]] = None,
         circumshapes: Optional[Union[Callable, Animation]] = None,
-        indices: Optional[Iterable[int]] = None,
+        indices: Optional[Union[Iterable[int], np.ndarray]] = None,
     ):
     
         """
@@ -120,11 +330,10 @@ class CirumscribedJMatrix:
         if all is not None:
             circumshapes = items = all
 
-        indexes = indices or range(self.nitems)
-        mics = [x for i, x in enumerate(iter(self)) if i in indexes]
-
+        self.invalidate_focus()  # The animations may restyle the items
         anims = []
-        for mi, cs in mics:
+        for i in self.select(indices):
+            mi, cs = self.matrix_items[i], self.circumshapes[i]
             anims += [items(mi)] if items is not None else []
             anims += [circumshapes(cs)] if circumshapes is not None else []
 
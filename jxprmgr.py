@@ -1,10 +1,22 @@
+from contextlib import contextmanager
 from typing import Union, Callable, List
 from xmlrpc.client import Boolean
-from beartype import beartype
+from jxprcheck import beartype
 from manim import RIGHT
-from jxprutils import vgroup
-from copy import deepcopy
+from jxprutils import PENDING_LAYOUTS, vgroup
+from jxprmat import CirumscribedJMatrix, restyle
 from box import Box
+from jxprrecord import Record
+from jxprcow import cow_copy
+
+
+def arrange_right(jexpr):
+    return vgroup(*jexpr.values()).arrange(RIGHT, buff=0.4)
+
+
+# set_property calls that leave the layout of the subexpressions as it is
+STYLE_PROPERTIES = {"set_opacity", "set_color", "set_fill", "set_stroke", "fade"}
+
 
 class JExpressionManager:
 
@@ -54,15 +66,24 @@ class JExpressionManager:
     #                        func = lambda x: x[1].set_opacity(1)).grouped_expr),
     #     run_time=3)
 
+    # The layout (the grouper run on the subexpressions) is lazy: structural
+    # edits (update, reorder, set_grouper) only mark it stale, and it is redone
+    # once when the subexpressions are next read or moved, or a scene plays.
+
     @beartype
     def __init__(self, expr: Union[dict, Box]):
-        self.__jexpr__ = Box(expr, box_dots=True)
-        self.__grouper__ = lambda x: vgroup(*x.values()).arrange(RIGHT, buff=0.4)
+        self.__jexpr__ = Record(expr)
+        self.__grouper__ = arrange_right
+        self.__grouped_jexpr__ = None
+        self.__batch__ = 0
         self.regroup()
         self.__order__ = []
 
     def copy(self):
-        return deepcopy(self)
+        clone = cow_copy(self)
+        if clone.__grouped_jexpr__ is None:
+            PENDING_LAYOUTS.add(clone)
+        return clone
 
     @beartype
     def set_order(self, order: List[str]):
@@ -71,13 +92,47 @@ class JExpressionManager:
 
     @beartype
     def regroup(self):
-        self.__grouped_jexpr__ = self.__grouper__(self.__jexpr__)
+        self.__grouped_jexpr__ = None
+        PENDING_LAYOUTS.add(self)
+        return self
+
+    def layout(self):
+        """
+        Runs the grouper if the layout is stale.
+        """
+        if self.__grouped_jexpr__ is None:
+            self.__grouped_jexpr__ = self.__grouper__(self.__jexpr__)
+            PENDING_LAYOUTS.discard(self)
+        return self
+
+    def settle(self):
+        # Outside of a batch, edits see the subexpressions laid out
+        if not self.__batch__:
+            self.layout()
         return self
 
+    @contextmanager
+    def batch(self):
+        """
+        Lays the expression out once, when the block ends:
+
+            with expr.batch():
+                expr.update(...).reorder(order).set_scale(0.9, subexpr=["verb"])
+
+        Unlike outside of a batch, edits such as scale apply to the
+        subexpressions where they are, before the pending layout.
+        """
+        self.__batch__ += 1
+        try:
+            yield self
+        finally:
+            self.__batch__ -= 1
+        self.settle()
+
     @beartype
     def reorder(self, order: List[str] = []):
         order = order or self.__order__
-        self.__jexpr__ = Box({k: self.__jexpr__[k] for k in order})
+        self.__jexpr__ = Record({k: self.__jexpr__[k] for k in order})
         self.regroup()
         return self
 
@@ -93,15 +148,15 @@ class JExpressionManager:
 
     @property
     def jexpr(self):
-        return self.__jexpr__
+        return self.settle().__jexpr__
 
     @property
     def grouped_expr(self):
-        return self.__grouped_jexpr__
+        return self.layout().__grouped_jexpr__
 
     @beartype
     def update(self, subexpr: Union[dict, Box]):
-        self.__jexpr__ |= Box(subexpr)
+        self.__jexpr__ |= subexpr
         self.regroup()
         return self       
         
@@ -113,6 +168,9 @@ class JExpressionManager:
             else self.__jexpr__.keys()
         )
 
+        if func not in STYLE_PROPERTIES:
+            self.settle()
+
         for k in keys:
             if hasattr(self.__jexpr__[k], func):
                 getattr(self.__jexpr__[k], func)(*args, **kwargs)
@@ -120,6 +178,45 @@ class JExpressionManager:
                 getattr(self.__jexpr__[k].matrix, func)(*args, **kwargs)
         return self
 
+    @beartype
+    def style(self, spec: dict):
+        """
+        Restyles the expression in one pass per mobject. spec maps a subexpr,
+        or for matrices a (subexpr, part) or (subexpr, part, indices) tuple
+        (see CirumscribedJMatrix.style), to properties (see restyle):
+
+            expr.style({"verb": {"scale": 0.9}, ("x", "circumshapes"): {"opacity": 0}})
+
+        A scale given for a whole subexpr scales it as set_scale does.
+        """
+        if any("scale" in props for props in spec.values()):
+            self.settle()
+
+        scales, specs = {}, {}
+        for key, props in spec.items():
+            k, *part = (key,) if isinstance(key, str) else key
+            if not part and "scale" in props:
+                props = dict(props)
+                scales[k] = props.pop("scale")
+            part = "all" if not part else part[0] if len(part) == 1 else tuple(part)
+            if props:
+                specs.setdefault(k, {}).setdefault(part, {}).update(props)
+
+        for k, factor in scales.items():
+            mob = self.__jexpr__[k]
+            (mob.matrix if isinstance(mob, CirumscribedJMatrix) else mob).scale(factor)
+
+        for k, parts in specs.items():
+            mob = self.__jexpr__[k]
+            if isinstance(mob, CirumscribedJMatrix):
+                mob.style(parts)
+            elif set(parts) != {"all"}:
+                raise ValueError(f"{k} is not a matrix, only its whole can be styled")
+            else:
+                restyle(mob, **parts["all"])
+
+        return self
+
     def set_opacity(self, *args, **kwargs):
         return self.set_property("set_opacity", *args, **kwargs)
 
@@ -133,6 +230,7 @@ class JExpressionManager:
     def transform(self, func: Callable, subexpr: List[str] = []):
         keys = self.__jexpr__.keys() if not subexpr else subexpr
 
+        self.settle()
         for k in keys:
             self.__jexpr__[k] = func(self.__jexpr__[k])
             
@@ -0,0 +1,202 @@
+# CPU profiles of scenes, enabled by JXPR_CPU_PROFILE=cprofile|sample
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Tuple
+
+from jxprcheck import beartype
+
+CPU_PROFILE = os.environ.get("JXPR_CPU_PROFILE")
+CPU_PROFILE_DIR = os.environ.get("JXPR_CPU_PROFILE_DIR", "media/profiles")
+SAMPLE_INTERVAL = 0.001  # Seconds
+
+# Paths of the collapsed stacks below this share of the total are dropped
+MIN_SHARE = 1e-4
+
+Func = Tuple[str, int, str]  # As in pstats: (filename, line, function)
+
+# SceneProfilers currently recording. Scenes set up inside a profiled one
+# (restore_scene) are recorded as part of it: a second cProfile.Profile
+# fails to enable on Python 3.12 and takes over the first one before.
+ACTIVE = []
+
+
+@beartype
+def func_label(func: Func) -> str:
+    filename, line, name = func
+    if filename == "~":  # Builtins
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class Sampler:
+    """
+    Statistical profiler: a thread records the stack of the profiled thread
+    about every SAMPLE_INTERVAL seconds (the GIL decides exactly when), which
+    costs far less than cProfile's tracing of every call. Each stack is
+    weighted by the time elapsed since the previous sample.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.thread = None
+
+    def sample(self, thread_id: int, stop: threading.Event):
+        last = time.perf_counter()
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+
+            # Keep what runs under the outermost SceneProfiler.wrap (nested
+            # scenes included), without the profiler
+            own = [i for i, f in enumerate(stack) if f[0] == __file__]
+            if own:
+                stack = [f for f in stack[: own[-1]] if f[0] != __file__]
+                self.stacks[tuple(reversed(stack))] += now - last
+            last = now
+
+    def enable(self):
+        self.stop = threading.Event()
+        self.thread = threading.Thread(
+            target=self.sample, args=(threading.get_ident(), self.stop), daemon=True
+        )
+        self.thread.start()
+
+    def disable(self):
+        self.stop.set()
+        self.thread.join()
+
+    def create_stats(self):
+        """
+        pstats data in the format of cProfile.Profile.stats (call counts are
+        sample counts), so that pstats.Stats can load it.
+        """
+        stats = {}
+
+        def entry(func):
+            return stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+
+        for stack, t in self.stacks.items():
+            entry(stack[-1])[2] += t
+            for func in dict.fromkeys(stack):
+                e = entry(func)
+                e[0] += 1
+                e[1] += 1
+                e[3] += t
+            for caller, callee in zip(stack, stack[1:]):
+                edge = entry(callee)[4].setdefault(caller, [0, 0, 0.0, 0.0])
+                edge[0] += 1
+                edge[1] += 1
+                edge[3] += t
+
+        self.stats = {
+            func: (cc, nc, tt, ct, {c: tuple(e) for c, e in callers.items()})
+            for func, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    def collapsed(self) -> Dict[str, float]:
+        """
+        Collapsed stacks in microseconds.
+        """
+        return {
+            ";".join(func_label(f) for f in stack): 1e6 * t
+            for stack, t in self.stacks.items()
+        }
+
+
+@beartype
+def collapse_stats(stats: dict) -> Dict[str, float]:
+    """
+    Collapsed stacks (in microseconds) estimated from cProfile's call graph,
+    which only keeps caller -> callee edges: the time of a function along a
+    path is split between its callees in proportion to the edge times.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    roots = [f for f, s in stats.items() if not s[4]]
+    total = sum(stats[f][3] for f in roots) or 1.0
+
+    stacks = {}
+
+    def walk(func: Func, path: Tuple[str, ...], t: float):
+        if t < MIN_SHARE * total:
+            return
+        _, _, tt, ct, _ = stats[func]
+        path = path + (func_label(func),)
+        if ct > 0:
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0) + 1e6 * t * tt / ct
+            for callee, edge_time in callees.get(func, {}).items():
+                if func_label(callee) not in path:  # Recursion
+                    walk(callee, path, t * edge_time / ct)
+
+    for root in roots:
+        walk(root, (), stats[root][3])
+
+    return stacks
+
+
+class SceneProfiler:
+    """
+    Profiles a scene's setup and construct with cProfile or the Sampler, and
+    writes <module>.<Scene>.pstats and .collapsed (one "a;b;c count" line
+    per stack, for flamegraph.pl or speedscope) to CPU_PROFILE_DIR.
+    """
+
+    def __init__(self, scene, mode: str, profile_dir: str = CPU_PROFILE_DIR):
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unsupported profiler {mode}, use cprofile or sample")
+
+        cls = type(scene)
+        self.dir, self.name = Path(profile_dir), f"{cls.__module__}.{cls.__name__}"
+        self.profiler = cProfile.Profile() if mode == "cprofile" else Sampler()
+
+        for name in ["setup", "construct"]:
+            setattr(scene, name, self.wrap(getattr(scene, name)))
+
+    def wrap(self, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if ACTIVE:  # Nested scene, already recorded by the active profiler
+                return method(*args, **kwargs)
+
+            ACTIVE.append(self)
+            self.profiler.enable()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.profiler.disable()
+                ACTIVE.remove(self)
+
+        return wrapper
+
+    def close(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(self.profiler)
+        stats.dump_stats(self.dir / f"{self.name}.pstats")
+
+        if isinstance(self.profiler, Sampler):
+            stacks = self.profiler.collapsed()
+        else:
+            stacks = collapse_stats(stats.stats)
+
+        with open(self.dir / f"{self.name}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks.items()):
+                if round(count):
+                    f.write(f"{stack} {round(count)}\n")
@@ -0,0 +1,196 @@
+import re
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+from jxprcheck import beartype
+
+
+def divide(x, y):
+    """
+    J's %: x % 0 is infinite and 0 % 0 is 0.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((x == 0) & (y == 0), 0.0, np.true_divide(x, y))
+
+
+# J primitives evaluated atom by atom (rank 0 0)
+VERBS = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "%": divide,
+    ">.": np.maximum,
+    "<.": np.minimum,
+}
+
+VERB_PATTERN = re.compile(
+    r'^\(?\s*(?P<verb>[^"\s()]+)\s*(?:"\s*(?P<rank>[_\d\s]+))?\)?$'
+)
+
+
+class LengthError(ValueError):
+    """
+    The frames of the operands do not agree, e.g. ``3 2 1 + i. 4 3``.
+    """
+
+
+@beartype
+def parse_atom(atom: str) -> Union[int, float]:
+    """
+    Parses a J numeric literal, where ``_`` is the negative sign.
+    """
+    atom = atom.strip().replace("_", "-")
+    try:
+        return int(atom)
+    except ValueError:
+        return float(atom)
+
+
+@beartype
+def format_atom(atom) -> str:
+    """
+    Displays a number as J does: ``_`` is the negative sign and infinity,
+    and floats keep 6 significant digits, e.g. ``_0.333333``, ``1e_7``, ``__``.
+    """
+    if isinstance(atom, (float, np.floating)):
+        if np.isinf(atom):
+            return "__" if atom < 0 else "_"
+        atom = float(atom) + 0.0  # No negative zero
+        atom = re.sub(
+            r"e([+-])0*(\d)", lambda m: "e" + "_" * (m[1] == "-") + m[2], f"{atom:.6g}"
+        )
+    atom = str(atom)
+    return "_" + atom[1:] if atom.startswith("-") else atom
+
+
+@beartype
+def parse_array(matrix: Union[List, Tuple]) -> np.ndarray:
+    """
+    Converts the nested string lists of lib.toml into an array.
+
+    A single entry is an atom and a single row a list. Rows separated by an
+    all blank row are the planes of a rank 3 array.
+    """
+    planes, plane = [], []
+    for row in matrix:
+        if all(not e.strip() for e in row):
+            planes.append(plane)
+            plane = []
+        else:
+            plane.append([parse_atom(e) for e in row])
+    planes.append(plane)
+
+    array = np.array(planes)
+    if len(planes) > 1:
+        return array
+    if len(planes[0]) > 1:
+        return array[0]
+    if len(planes[0][0]) > 1:
+        return array[0, 0]
+    return array[0, 0, 0, ...]
+
+
+@beartype
+def format_array(array: np.ndarray) -> List[List[str]]:
+    """
+    Inverse of ``parse_array``.
+    """
+    if array.ndim > 3:
+        raise ValueError(f"Cannot display arrays of rank {array.ndim}")
+
+    atoms = np.vectorize(format_atom, otypes=[object])(array)
+    if array.ndim < 2:
+        return [list(np.atleast_1d(atoms))]
+    if array.ndim == 2:
+        return [list(row) for row in atoms]
+
+    blank = [""] * array.shape[-1]
+    rows = []
+    for i, plane in enumerate(atoms):
+        rows += ([blank] if i else []) + [list(row) for row in plane]
+    return rows
+
+
+@beartype
+def parse_verb(verb: str) -> Tuple[Callable, Tuple[int, int]]:
+    """
+    Parses verbs like ``+``, ``(+"0 0)`` or ``(+"1)`` into the function
+    applied to atoms and the dyadic (left, right) rank.
+    """
+    match = VERB_PATTERN.match(verb.strip())
+    if match is None or match["verb"] not in VERBS:
+        raise ValueError(f"Unsupported verb {verb}")
+
+    ranks = [parse_atom(r) for r in (match["rank"] or "0").split()]
+    ranks = ranks[-2:] if len(ranks) > 1 else ranks * 2
+
+    return VERBS[match["verb"]], (ranks[0], ranks[1])
+
+
+@beartype
+def effective_rank(rank: int, array: np.ndarray) -> int:
+    if rank < 0:
+        return max(0, array.ndim + rank)
+    return min(rank, array.ndim)
+
+
+@beartype
+def agree(
+    x: np.ndarray, y: np.ndarray, nx: int, ny: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reshapes x and y so that their frames, the leading ``nx`` and ``ny`` axes,
+    agree as in J: the shorter frame must be a prefix of the longer one, and
+    each cell of the shorter frame is repeated across the rest of the longer.
+    """
+    fx, fy = x.shape[:nx], y.shape[:ny]
+    common = min(nx, ny)
+    if fx[:common] != fy[:common]:
+        raise LengthError(f"Frames {fx} and {fy} do not agree")
+
+    x = x.reshape(fx + (1,) * (max(nx, ny) - nx) + x.shape[nx:])
+    y = y.reshape(fy + (1,) * (max(nx, ny) - ny) + y.shape[ny:])
+    return x, y
+
+
+@beartype
+def apply_dyad(
+    func: Callable, x: np.ndarray, y: np.ndarray, rank: Tuple[int, int] = (0, 0)
+) -> np.ndarray:
+    """
+    Applies the atomic verb ``func`` between cells of rank ``rank`` of x and y.
+
+    The frames around the cells agree first, then (since the verb works atom
+    by atom) the cells themselves, e.g. with ``+"1 0`` each atom of y is added
+    to the whole list x.
+    """
+    lx, ly = effective_rank(rank[0], x), effective_rank(rank[1], y)
+    x, y = agree(x, y, x.ndim - lx, y.ndim - ly)
+
+    # Both now have the same frame length, align the cells within it
+    frame = x.ndim - lx
+    cx, cy = x.shape[frame:], y.shape[frame:]
+    common = min(lx, ly)
+    if cx[:common] != cy[:common]:
+        raise LengthError(f"Cells {cx} and {cy} do not agree")
+
+    x = x.reshape(x.shape + (1,) * (max(lx, ly) - lx))
+    y = y.reshape(y.shape + (1,) * (max(lx, ly) - ly))
+
+    return np.asarray(func(x, y))
+
+
+@beartype
+def evaluate(
+    verb: str, x: Union[List, Tuple], y: Union[List, Tuple]
+) -> Optional[List[List[str]]]:
+    """
+    Evaluates ``x verb y`` on lib.toml matrices, returning None when the
+    operands are not numeric (e.g. ``?``) or do not agree.
+    """
+    try:
+        func, rank = parse_verb(verb)
+        x, y = parse_array(x), parse_array(y)
+        return format_array(apply_dyad(func, x, y, rank))
+    except (ValueError, TypeError):
+        return None
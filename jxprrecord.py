@@ -0,0 +1,53 @@
+class Record(dict):
+    """
+    dict whose keys are also attributes, for the expressions and registries
+    read in per-item loops. Unlike Box it converts nothing, so an attribute
+    costs a dict lookup.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):  # Protocol lookups of copy, pickle, ...
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    __setattr__ = dict.__setitem__
+
+    def __delattr__(self, name):
+        try:
+            del self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class Registry(Record):
+    """
+    Record of the mobjects of a scene, where missing entries are new lists
+    (as Box(default_box=True, default_box_attr=[]) had them), e.g.
+
+        mobs = Registry()
+        mobs.descr.append(Text("..."))
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        value = self[key] = []
+        return value
+
+
+def merge(defaults: dict, overrides: dict) -> dict:
+    """
+    defaults updated with overrides, merging the dicts they both have (as
+    Box(defaults) + Box(overrides) did) without converting either.
+    """
+    merged = dict(defaults)
+    for k, v in overrides.items():
+        if isinstance(v, dict) and isinstance(merged.get(k), dict):
+            v = merge(merged[k], v)
+        merged[k] = v
+    return merged
@@ -0,0 +1,79 @@
+import inspect
+import io
+import pickle
+from types import FunctionType
+from manim import logger
+from jxprcheck import beartype
+from jxprcache import cache_path, write_atomic
+from jxprhash import scene_fingerprint
+
+
+def _unrestorable(name):
+    def unrestorable(*args, **kwargs):
+        raise RuntimeError(f"{name} is not restored from scene snapshots")
+
+    return unrestorable
+
+
+class SnapshotPickler(pickle.Pickler):
+    """
+    Pickles lambdas and local functions (groupers, element_to_mobject, ...)
+    as stubs; downstream scenes only read the mobjects they produced.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, FunctionType) and "<" in obj.__qualname__:
+            return _unrestorable, (obj.__qualname__,)
+        return NotImplemented
+
+
+class SceneSnapshot:
+    def __init__(self, mobs):
+        self.mobs = mobs
+
+
+@beartype
+def snapshot_path(scene_class: type, topic: str):
+    fingerprint = scene_fingerprint(
+        inspect.getsourcefile(scene_class), scene_class.__name__, topic
+    )
+    return cache_path("snapshots", f"{scene_class.__name__}-{fingerprint[:16]}.pickle")
+
+
+@beartype
+def dumps(mobs) -> bytes:
+    buffer = io.BytesIO()
+    SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(mobs)
+    return buffer.getvalue()
+
+
+@beartype
+def restore_scene(scene_class: type, topic: str):
+    """
+    Returns the ``mobs`` registry of ``scene_class`` after its setup.
+
+    The registry is loaded from the snapshot store when its sources are
+    unchanged, otherwise the scene is set up once and its snapshot saved for
+    every later scene (and render) that builds on it.
+    """
+    path = snapshot_path(scene_class, topic)
+    if path.exists():
+        try:
+            return SceneSnapshot(pickle.loads(path.read_bytes()))
+        except (pickle.UnpicklingError, OSError, AttributeError, ImportError) as e:
+            # Unreadable, or stale (classes moved in another manim), rebuild
+            logger.warning(f"Rebuilding snapshot {path.name}: {e!r}")
+
+    scene = scene_class()
+    scene.setup()
+
+    try:
+        data = dumps(scene.mobs)
+        write_atomic(path, data)
+    except (pickle.PicklingError, TypeError, OSError) as e:
+        # TypeError: objects pickle refuses outright (locks, generators, ...)
+        logger.warning(f"Not snapshotting {scene_class.__name__}: {e!r}")
+        return scene
+
+    # Detached copy, same as a snapshot loaded from disk
+    return SceneSnapshot(pickle.loads(data))
@@ -0,0 +1,212 @@
+import ast
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import toml
+from jxprcheck import beartype
+from manim import MathTex, Tex, config, logger
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import (
+    compile_tex,
+    convert_to_svg,
+    generate_tex_file,
+    make_tex_compilation_command,
+)
+
+TEX_CLASSES = {"Tex": Tex, "MathTex": MathTex}
+
+PAGE_ENV = "jxprpage"
+
+
+@beartype
+def collect_tex(modules: List[str], lib: str = "lib.toml") -> List[Tuple[str, str]]:
+    """
+    Returns (class name, tex string) of every Tex a chapter uses: the
+    ``[equals]`` entries of lib.toml (see ``make_equals``) and the literal
+    Tex/MathTex calls of the scene modules.
+    """
+    found = [("Tex", v) for v in toml.load(lib).get("equals", {}).values()]
+
+    for module in modules:
+        tree = ast.parse(Path(module).read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id in TEX_CLASSES
+                and node.args
+                and all(
+                    isinstance(a, ast.Constant) and isinstance(a.value, str)
+                    for a in node.args
+                )
+            ):
+                found.append((node.func.id, "".join(a.value for a in node.args)))
+
+    return list(dict.fromkeys(found))
+
+
+class _TexFile(Exception):
+    def __init__(self, path: Path, tex_template):
+        self.path, self.tex_template = path, tex_template
+
+
+def _record_tex_file(expression, environment=None, tex_template=None):
+    tex_template = tex_template or config["tex_template"]
+    raise _TexFile(generate_tex_file(expression, environment, tex_template), tex_template)
+
+
+@beartype
+def tex_file(cls: str, tex: str):
+    """
+    Returns the .tex file (and template) manim writes for ``cls(tex)``, without
+    compiling it. The svg next to this file is what manim's Tex cache looks up.
+    """
+    compile_tex = tex_mobject.tex_to_svg_file
+    tex_mobject.tex_to_svg_file = _record_tex_file
+    try:
+        TEX_CLASSES[cls](tex)
+    except _TexFile as recorded:
+        return recorded.path, recorded.tex_template
+    finally:
+        tex_mobject.tex_to_svg_file = compile_tex
+
+
+@beartype
+def split_document(code: str) -> Tuple[str, str]:
+    preamble, body = code.split(r"\begin{document}", 1)
+    return preamble, body.rsplit(r"\end{document}", 1)[0]
+
+
+@beartype
+def multi_page(documentclass: str) -> Optional[str]:
+    """
+    The standalone ``documentclass`` with one page per PAGE_ENV, keeping its
+    options (preview, border, ...), or None for other classes.
+    """
+    match = re.fullmatch(r"\\documentclass(?:\[(.*)\])?\{standalone\}", documentclass)
+    if match is None:
+        return None
+    options = [o for o in (match[1] or "").split(",") if o.strip()]
+    options.append("multi=" + PAGE_ENV)
+    return r"\documentclass[" + ",".join(options) + "]{standalone}"
+
+
+@beartype
+def compile_batch(tex_files: List[Path], tex_template) -> List[Path]:
+    """
+    Compiles ``tex_files`` (sharing ``tex_template``) as the pages of a single
+    document in one latex + dvisvgm run, and writes each page as the svg of
+    the corresponding file.
+    """
+    preamble = split_document(tex_files[0].read_text(encoding="utf-8"))[0]
+    preamble = preamble.replace(
+        tex_template.documentclass, multi_page(tex_template.documentclass)
+    )
+
+    pages = [
+        r"\begin{" + PAGE_ENV + "}"
+        + split_document(f.read_text(encoding="utf-8"))[1]
+        + r"\end{" + PAGE_ENV + "}"
+        for f in tex_files
+    ]
+
+    document = "\n".join(
+        [
+            preamble,
+            r"\newenvironment{" + PAGE_ENV + "}{}{}",
+            r"\begin{document}",
+            *pages,
+            r"\end{document}",
+        ]
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        batch = tmp / "batch.tex"
+        batch.write_text(document, encoding="utf-8")
+
+        output_format = tex_template.output_format
+        subprocess.run(
+            make_tex_compilation_command(
+                tex_template.tex_compiler, output_format, batch, tmp
+            ),
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+        subprocess.run(
+            [
+                "dvisvgm",
+                *(["--pdf"] if output_format == ".pdf" else []),
+                "--page=1-",
+                "--no-fonts",
+                "--verbosity=0",
+                f"--output={(tmp / 'page-%p').as_posix()}",
+                batch.with_suffix(output_format).as_posix(),
+            ],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+        # dvisvgm pads %p to the digits of the last page (page-01, ...)
+        pages = sorted(tmp.glob("page-*.svg"), key=lambda f: int(f.stem[5:]))
+        if len(pages) != len(tex_files):
+            raise FileNotFoundError(
+                f"dvisvgm wrote {len(pages)} pages for {len(tex_files)} Tex files"
+            )
+
+        svgs = []
+        for page, f in zip(pages, tex_files):
+            svg = f.with_suffix(".svg")
+            shutil.move(page, svg)
+            svgs.append(svg)
+
+    return svgs
+
+
+@beartype
+def compile_each(tex_files: List[Path], tex_template) -> List[Path]:
+    """
+    Compiles ``tex_files`` one by one as manim does, reporting latex errors
+    for the file that has them.
+    """
+    output_format = tex_template.output_format
+    return [
+        convert_to_svg(
+            compile_tex(f, tex_template.tex_compiler, output_format), output_format
+        )
+        for f in tex_files
+    ]
+
+
+@beartype
+def prepare_tex(modules: List[str], lib: str = "lib.toml") -> List[Path]:
+    """
+    Fills manim's Tex cache with every Tex of the given scene modules so
+    that rendering them does not start a latex and dvisvgm process per Tex.
+    """
+    batches: Dict[str, Tuple[object, List[Path]]] = {}
+    for cls, tex in collect_tex(modules, lib):
+        path, tex_template = tex_file(cls, tex)
+        if path.with_suffix(".svg").exists():
+            continue
+        preamble = split_document(path.read_text(encoding="utf-8"))[0]
+        batches.setdefault(preamble, (tex_template, []))[1].append(path)
+
+    svgs = []
+    for tex_template, paths in batches.values():
+        paths = list(dict.fromkeys(paths))
+        if multi_page(tex_template.documentclass) is None:
+            svgs += compile_each(paths, tex_template)
+            continue
+        try:
+            svgs += compile_batch(paths, tex_template)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"Batched Tex failed ({e}), compiling each of {len(paths)}")
+            svgs += compile_each(paths, tex_template)
+
+    return svgs
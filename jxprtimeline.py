@@ -0,0 +1,215 @@
+from typing import Callable, List, Optional, Union
+from manim import (
+    DEFAULT_ANIMATION_RUN_TIME,
+    DEFAULT_WAIT_TIME,
+    Animation,
+    AnimationGroup,
+    Mobject,
+    Succession,
+    Wait,
+)
+from manim.animation.animation import prepare_animation
+
+
+def as_animation(animations) -> Animation:
+    """
+    Animations played together, run_time then scales them all as a group.
+    """
+    if isinstance(animations, (list, tuple)):
+        return AnimationGroup(*animations)
+    return prepare_animation(animations)
+
+
+class DeferredAnimation(Animation):
+    """
+    Step of a timeline whose animation is only built when the step starts,
+    so it picks up the state left by the steps before it, exactly as if it
+    had been passed to its own ``Scene.play``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable,
+        run_time: float = DEFAULT_ANIMATION_RUN_TIME,
+        **kwargs
+    ):
+        super().__init__(Mobject(), run_time=run_time, **kwargs)
+        self.factory = factory
+        self.animation = None
+        self.after = []
+
+    def _setup_scene(self, scene):
+        self.scene = scene
+
+    def begin(self):
+        animation = as_animation(self.factory())
+        animation.run_time = self.run_time
+        self.animation = animation
+
+        # As Scene.play would, also drawing them on every following frame
+        self.scene.add_mobjects_from_animations([animation])
+        animation._setup_scene(self.scene)
+        animation.begin()
+
+    def interpolate(self, alpha: float):
+        self.animation.interpolate(alpha)
+
+    def update_mobjects(self, dt: float):
+        self.animation.update_mobjects(dt)
+
+    def finish(self):
+        self.animation.finish()
+        self.animation.clean_up_from_scene(self.scene)
+        for func in self.after:
+            func()
+
+    def clean_up_from_scene(self, scene):
+        pass
+
+
+class Hold(Animation):
+    """
+    Animation leaving its mobject as it is, which makes manim redraw the
+    mobject on every frame rather than from the static frame.
+    """
+
+    def begin(self):
+        pass
+
+    def interpolate(self, alpha: float):
+        pass
+
+    def update_mobjects(self, dt: float):
+        pass
+
+    def finish(self):
+        pass
+
+    def clean_up_from_scene(self, scene):
+        pass
+
+
+def in_scene(mobjects, members: set):
+    """
+    The mobjects whose id is in members, or for the others (e.g. groups made
+    for the timeline) their submobjects that are.
+    """
+    for mob in mobjects:
+        if id(mob) in members:
+            yield mob
+        else:
+            yield from in_scene(mob.submobjects, members)
+
+
+def push(items: list, item):
+    """
+    Appends item to items and returns it, so that a step can hand the
+    mobjects it creates over to the following steps.
+    """
+    items.append(item)
+    return item
+
+
+class Timeline:
+    """
+    Records the per-item play/wait steps of a scene and plays them as a
+    single ``Succession`` (one partial movie file) when committed.
+
+    Steps are given as factories returning the animation(s) to play, since
+    they are usually built from the state left by the previous steps:
+
+        with Timeline(self, x.matrix) as tl:
+            for i in range(n):
+                tl.play(lambda i=i: FadeIn(x.set_focus([i]).matrix))
+                tl.call(lambda i=i: x.set_opacity(0.25, indices=[i]))
+                tl.wait(1)
+
+    Mobjects created by a step are passed on to later ones with ``push``.
+
+    The mobjects of the scene that the steps animate or change must be given
+    when creating the timeline (or groups of them), since manim draws the
+    others from a static frame cached when the timeline starts playing.
+    Scene.remove only takes effect between plays, so mobjects a step is done
+    with are hidden in the timeline and removed once it is played, which
+    keeps it to a single play:
+
+        tl.call(lambda: entry[0].set_opacity(0))
+        ...
+        self.remove(*entries)  # After the with block
+
+    With ``batch=False`` every step is played as soon as it is recorded.
+    """
+
+    def __init__(self, scene, *mobjects: Mobject, batch: bool = True):
+        self.scene = scene
+        self.mobjects = mobjects
+        self.batch = batch
+        self.steps: List[Animation] = []
+
+    def play(
+        self,
+        factory: Callable[[], Union[Animation, List[Animation]]],
+        run_time: Optional[float] = None,
+    ):
+        """
+        run_time must be given in batch mode when the animations are not of
+        the default length, since they are only created when played.
+        """
+        if not self.batch:
+            kwargs = {} if run_time is None else {"run_time": run_time}
+            self.scene.play(as_animation(factory()), **kwargs)
+        else:
+            if run_time is None:
+                run_time = DEFAULT_ANIMATION_RUN_TIME
+            self.steps.append(DeferredAnimation(factory, run_time))
+        return self
+
+    def wait(self, duration: float = DEFAULT_WAIT_TIME):
+        if not self.batch:
+            self.scene.wait(duration)
+        else:
+            self.steps.append(Wait(run_time=duration))
+        return self
+
+    def call(self, func: Callable):
+        """
+        Runs func (e.g. a set_opacity or Scene.remove) right after the steps
+        recorded so far.
+        """
+        if not self.batch or not self.steps:
+            func()
+            return self
+
+        if not isinstance(self.steps[-1], DeferredAnimation):
+            wait = self.steps.pop()
+            self.steps.append(DeferredAnimation(Wait, wait.run_time))
+        self.steps[-1].after.append(func)
+        return self
+
+    def commit(self):
+        """
+        Plays the steps recorded so far.
+        """
+        if not self.steps:
+            return
+
+        # Held, not grouped: Scene.play would move the mobjects of a group
+        # it adds to the end of the scene, and remove them with it after.
+        # Those removed from the scene since are left out, or it would add
+        # them back.
+        timeline = Succession(*self.steps)
+        members = {id(m) for m in self.scene.get_mobject_family_members()}
+        holds = [
+            Hold(m, run_time=timeline.run_time)
+            for m in in_scene(self.mobjects, members)
+        ]
+        self.scene.play(timeline, *holds)
+        self.scene.remove(timeline.mobject)
+        self.steps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
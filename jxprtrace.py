@@ -0,0 +1,281 @@
+# Timing trace of the play/wait calls of scenes, enabled by JXPR_TRACE=<dir>
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List
+
+from jxprcheck import beartype
+from manim import Scene, Wait
+
+from jxprprof import CPU_PROFILE, SceneProfiler
+
+TRACE_DIR = os.environ.get("JXPR_TRACE")
+
+# Where the wall time of a play call goes, besides the scene code before it
+PHASES = ["begin", "interpolate", "render", "encode"]
+
+
+def family_size(animations) -> Dict[str, int]:
+    family = {
+        id(m): m
+        for animation in animations
+        if animation.mobject is not None
+        for m in animation.mobject.get_family()
+    }
+    return {
+        "mobjects": len(family),
+        "points": sum(len(getattr(m, "points", ())) for m in family.values()),
+    }
+
+
+class Trace:
+    """
+    Records every play (and wait, which manim plays as a Wait) of a scene:
+    the animations and the mobjects and points they involve, the wall time
+    spent building them in scene code, beginning them, interpolating,
+    rendering and encoding frames, and the size of the partial movie file.
+    """
+
+    def __init__(self, scene: Scene, trace_dir: str):
+        cls = type(scene)
+        self.scene = scene
+        self.path = Path(trace_dir, f"{cls.__module__}.{cls.__name__}.jsonl")
+        self.records: List[dict] = []
+        self.beats: List[str] = []
+        self.current = None
+        self.last = self.start = time.perf_counter()
+
+        renderer = scene.renderer
+        self.timed(scene, "update_to_time", "interpolate")
+        self.timed(renderer, "update_frame", "render")
+        self.timed(renderer.file_writer, "write_frame", "encode")
+        self.timed(renderer.file_writer, "end_animation", "encode")
+        self.counted(renderer, "add_frame")
+
+    def timed(self, obj, name: str, phase: str):
+        method = getattr(obj, name, None)
+        if method is None:
+            return
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if self.current is None:
+                return method(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.current[phase] += time.perf_counter() - start
+
+        setattr(obj, name, wrapper)
+
+    def counted(self, obj, name: str):
+        method = getattr(obj, name, None)
+        if method is None:
+            return
+
+        @wraps(method)
+        def wrapper(frame, num_frames=1, *args, **kwargs):
+            if self.current is not None and not self.scene.renderer.skip_animations:
+                self.current["frames"] += num_frames
+            return method(frame, num_frames, *args, **kwargs)
+
+        setattr(obj, name, wrapper)
+
+    @contextmanager
+    def beat(self, name: str):
+        start, first = time.perf_counter(), len(self.records)
+        self.beats.append(name)
+        try:
+            yield
+        finally:
+            self.beats.pop()
+            self.records.append(
+                {
+                    "event": "beat",
+                    "beat": name,
+                    "parent": self.beats[-1] if self.beats else None,
+                    "plays": [r["index"] for r in self.records[first:] if "index" in r],
+                    "total": time.perf_counter() - start,
+                }
+            )
+
+    @contextmanager
+    def play(self):
+        start = time.perf_counter()
+        self.current = dict(
+            {phase: 0.0 for phase in PHASES}, frames=0, build=start - self.last
+        )
+        try:
+            yield
+        finally:
+            record, self.current = self.current, None
+            self.last = time.perf_counter()
+            record["total"] = self.last - start
+            record["begin"] = record["total"] - sum(
+                record[phase] for phase in PHASES[1:]
+            )
+            self.add_play(record)
+
+    def add_play(self, record: dict):
+        scene, renderer = self.scene, self.scene.renderer
+        animations = scene.animations or []
+        waits = len(animations) == 1 and isinstance(animations[0], Wait)
+
+        files = renderer.file_writer.partial_movie_files
+        record.update(
+            event="wait" if waits else "play",
+            index=len(files) - 1,
+            beat=self.beats[-1] if self.beats else None,
+            animations=[type(a).__name__ for a in animations],
+            run_time=getattr(scene, "duration", None),
+            cached=bool(renderer.skip_animations),
+            partial_file=files[-1] if files else None,
+            **family_size(animations),
+        )
+        self.records.append(record)
+
+    def summary(self) -> dict:
+        plays = [r for r in self.records if r["event"] in ("play", "wait")]
+        beats = {}
+        for r in self.records:
+            if r["event"] == "beat":
+                beats[r["beat"]] = beats.get(r["beat"], 0) + r["total"]
+
+        return {
+            "event": "summary",
+            "scene": type(self.scene).__name__,
+            "wall": time.perf_counter() - self.start,
+            "plays": sum(r["event"] == "play" for r in plays),
+            "waits": sum(r["event"] == "wait" for r in plays),
+            "frames": sum(r["frames"] for r in plays),
+            "bytes": sum(r["bytes"] or 0 for r in plays),
+            **{k: sum(r[k] for r in plays) for k in ["build", *PHASES]},
+            "beats": beats,
+            "slowest": [
+                r["index"] for r in sorted(plays, key=lambda r: -r["total"])[:5]
+            ],
+        }
+
+    def close(self):
+        # Partial movie files are complete by the time the scene is rendered
+        for r in self.records:
+            if r["event"] in ("play", "wait"):
+                f = r["partial_file"]
+                r["bytes"] = os.path.getsize(f) if f and os.path.exists(f) else None
+                r["partial_file"] = f and str(f)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for r in self.records + [self.summary()]:
+                f.write(json.dumps(r, default=str) + "\n")
+
+
+class TracedScene(Scene):
+    """
+    Scene writing a Trace of its play calls to JXPR_TRACE/<module>.<Scene>.jsonl
+    when JXPR_TRACE is set, and a CPU profile of its setup and construct
+    when JXPR_CPU_PROFILE is (see jxprprof).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.trace = Trace(self, TRACE_DIR) if TRACE_DIR else None
+        self.cpu_profiler = SceneProfiler(self, CPU_PROFILE) if CPU_PROFILE else None
+
+    def play(self, *args, **kwargs):
+        if self.trace is None:
+            return super().play(*args, **kwargs)
+        with self.trace.play():
+            return super().play(*args, **kwargs)
+
+    def render(self, *args, **kwargs):
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            if self.trace is not None:
+                self.trace.close()
+            if self.cpu_profiler is not None:
+                self.cpu_profiler.close()
+
+
+def beat(method):
+    """
+    Groups the play calls made by a scene method (e.g. show_mobj) in the trace,
+    under the method name and its attr argument.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        trace = getattr(self, "trace", None)
+        if trace is None:
+            return method(self, *args, **kwargs)
+
+        name = method.__name__
+        if kwargs.get("attr") is not None:
+            name += ":" + kwargs["attr"]
+        with trace.beat(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@beartype
+def load_traces(trace_dir: str) -> Dict[str, List[dict]]:
+    traces = {}
+    for path in sorted(Path(trace_dir).glob("*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            traces[path.stem] = [json.loads(line) for line in f if line.strip()]
+    return traces
+
+
+@beartype
+def report(traces: Dict[str, List[dict]], top: int = 10) -> str:
+    """
+    Per-scene totals, then the slowest play calls and beats across scenes.
+    """
+    columns = ["wall", "build", *PHASES]
+    lines = [f"{'scene':<48}" + "".join(f"{c:>12}" for c in columns)]
+    for name, records in traces.items():
+        summary = records[-1]
+        lines.append(f"{name:<48}" + "".join(f"{summary[c]:>12.2f}" for c in columns))
+
+    def ranked(event: str) -> List[dict]:
+        found = [
+            dict(r, scene=name)
+            for name, records in traces.items()
+            for r in records
+            if r["event"] == event
+        ]
+        return sorted(found, key=lambda r: -r["total"])[:top]
+
+    lines += ["", "Slowest play calls"]
+    for r in ranked("play"):
+        lines.append(
+            f"{r['total']:>8.2f}s {r['scene']}[{r['index']}] "
+            f"{'+'.join(r['animations'])} ({r['beat'] or '-'}): "
+            f"{r['mobjects']} mobjects, {r['points']} points, {r['frames']} frames"
+        )
+
+    lines += ["", "Slowest beats"]
+    for r in ranked("beat"):
+        lines.append(
+            f"{r['total']:>8.2f}s {r['scene']} {r['beat']} "
+            f"(plays {', '.join(map(str, r['plays']))})"
+        )
+
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the scene traces")
+    parser.add_argument("trace_dir", nargs="?", default=TRACE_DIR or "media/traces")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(report(load_traces(args.trace_dir), args.top))
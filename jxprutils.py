@@ -1,13 +1,22 @@
+import os
+import weakref
 from decimal import Rounded
 from manim import *
+from manim.animation.animation import prepare_animation
 from jxprmat import CirumscribedJMatrix
-import toml
+from jxprcache import cached_text
+from jxprconf import load_config
+from jxprrecord import merge
+from jxprtrace import TracedScene
 from box import Box
 from dataclasses import dataclass
-from beartype import beartype
-from typing import Union, List, Tuple
+from jxprcheck import beartype
+from typing import Optional, Union, List, Tuple
 
-DEFAULTS = Box(toml.load("defaults.toml"), box_dots=True, frozen_box=True)
+DEFAULTS = load_config("defaults.toml")
+
+# JExpressionManagers whose layout is stale, laid out before every play
+PENDING_LAYOUTS = weakref.WeakSet()
 
 
 @beartype
@@ -30,24 +39,23 @@ def make_circummat(
     matrix: Union[List, Tuple],
     circumitems: str = DEFAULTS.matrix.circumitems,
     circumshape: Mobject = None,
+    compact: bool = DEFAULTS.matrix.compact,
     **kwargs
 ) -> CirumscribedJMatrix:
 
-    defaults = Box(
-        {
-            "element_to_mobject": Text,
-            "element_to_mobject_config": {
-                "font": DEFAULTS.fonts.mono,
-                "color": DEFAULTS.fonts.color,
-                "font_size": DEFAULTS.fonts.size,
-            },
-            "v_buff": DEFAULTS.matrix.v_buff,
-            "h_buff": DEFAULTS.matrix.h_buff,
-            "element_alignment_corner": DEFAULTS.matrix.element_alignment_corner,
-        }
-    )
-
-    matargs = Box(defaults) + Box(kwargs, default_box=True)
+    defaults = {
+        "element_to_mobject": cached_text,
+        "element_to_mobject_config": {
+            "font": DEFAULTS.fonts.mono,
+            "color": DEFAULTS.fonts.color,
+            "font_size": DEFAULTS.fonts.size,
+        },
+        "v_buff": DEFAULTS.matrix.v_buff,
+        "h_buff": DEFAULTS.matrix.h_buff,
+        "element_alignment_corner": DEFAULTS.matrix.element_alignment_corner,
+    }
+
+    matargs = merge(defaults, kwargs)
     mat = MobjectMatrix(matrix, **matargs)
     mat.get_brackets().set_opacity(0)
 
@@ -55,7 +63,7 @@ def make_circummat(
         circumshape = RoundedRectangle(
             **DEFAULTS.box.options, **DEFAULTS.box.sizes[circumitems]
         )
-    return CirumscribedJMatrix(mat, ("get_" + circumitems), circumshape)
+    return CirumscribedJMatrix(mat, ("get_" + circumitems), circumshape, compact)
 
 
 make_term = make_circummat
@@ -63,21 +71,23 @@ make_term = make_circummat
 
 @beartype
 def make_verb(verb: str, **kwargs) -> Text:
-    format = Box(
+    format = merge(
         {
             "font": DEFAULTS.fonts.mono,
             "color": DEFAULTS.verb.color,
             "font_size": DEFAULTS.verb.font_size,
-        }
-    ) + Box(kwargs, default_box=True)
+        },
+        kwargs,
+    )
     return Text(verb, **format)
 
 
 @beartype
 def make_equals(equals: str, **kwargs) -> Tex:
-    format = Box(
+    format = merge(
         {"color": DEFAULTS.equals.color, "font_size": DEFAULTS.equals.font_size},
-    ) + Box(kwargs, default_box=True)
+        kwargs,
+    )
     return Tex(equals, **format)
 
 
@@ -109,9 +119,63 @@ def make_title(
     return title
 
 
+@beartype
+def get_profile(name: Optional[str] = None) -> Box:
+    """
+    Render profile (see [profiles] in defaults.toml) called name, by default
+    the one set by the JXPR_PROFILE environment variable or scene.profile.
+    """
+    name = name or os.environ.get("JXPR_PROFILE") or DEFAULTS.scene.profile
+    return DEFAULTS.profiles[name]
+
+
+# Animations that leave the scene as it was, which ProfiledScene.decorate
+# skips in profiles without decorations
+DECORATIONS = (Circumscribe, Wiggle)
+
+
 @dataclass(frozen=True)
 class SceneConfig:
     title: VGroup
     font_sans: str = DEFAULTS.fonts.sans
     font_mono: str = DEFAULTS.fonts.mono
     wait_time: int = DEFAULTS.scene.wait_time
+    batch_animations: bool = DEFAULTS.scene.batch_animations
+
+
+class ProfiledScene(TracedScene):
+    """
+    Scene whose waits and run_times are scaled by the render profile, and
+    which leaves out decorations (see ``decorate``) when the profile does.
+    """
+
+    profile = get_profile()
+
+    def scale_time(self, run_time: float) -> float:
+        return max(run_time * self.profile.time_scale, 1 / config.frame_rate)
+
+    def play(self, *args, **kwargs):
+        # Scene.wait plays a Wait, which is scaled here too
+        if self.profile.time_scale != 1:
+            if "run_time" in kwargs:
+                kwargs["run_time"] = self.scale_time(kwargs["run_time"])
+            else:
+                args = [prepare_animation(a) for a in args]
+                for animation in args:
+                    animation.run_time = self.scale_time(animation.run_time)
+
+        # So that expressions on screen never show a stale layout
+        for expr in list(PENDING_LAYOUTS):
+            expr.settle()
+
+        super().play(*args, **kwargs)
+
+    def decorate(self, *args, **kwargs):
+        """
+        Plays the animations, leaving out the DECORATIONS among them when the
+        profile skips decorations.
+        """
+        if not self.profile.decorations:
+            args = [a for a in args if not isinstance(a, DECORATIONS)]
+        if args:
+            self.play(*args, **kwargs)
@@ -1,38 +1,213 @@
 # Orders videos from manim per sequence.toml to make the final presentation
 
+import argparse
+import hashlib
+import json
 import toml
 import os
 import shutil
-  
-seq = toml.load("sequence.toml")
-print(seq)
-
-target_folder = seq['configs']['target_folder']
-if not os.path.exists(target_folder):
-    os.makedirs(target_folder)
-
-scene_number = 0
-for chapter in seq['chapters']:
-    for k, v in chapter.items():
-        video_path = os.path.join(seq['configs']['base_dir'], k, "480p15")
-        
-        src = [os.path.join(video_path, x + ".mp4") 
-               for x in chapter[k]['scene_order']]
-        
-        dest = chapter[k]['scene_order']
-        num_scenes = len(dest)     
-        
-        if seq['configs']['prepend_basename']:
-            dest = [(chapter[k]['basename'] + x) for x in dest]
-        
-        filenums = [scene_number + x for x in range(num_scenes)]
-        dest = [os.path.join(target_folder, f'{x:02}_{y}.mp4') 
-                for x, y in zip(filenums, dest)]
-        
-        scene_number += num_scenes
-        
-        for x, y in zip(src, dest):
-            if (os.path.exists(x)):
-                shutil.copyfile(x, y)
-        
-        # print(src, dest)
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FICLONE = 0x40049409  # Linux ioctl cloning a file's extents (reflink)
+
+
+def get_chapters(seq):
+    target_folder = seq['configs']['target_folder']
+    quality = seq['configs'].get('quality', "480p15")
+
+    chapters = []
+    scene_number = 0
+    for chapter in seq['chapters']:
+        for k, v in chapter.items():
+            video_path = os.path.join(seq['configs']['base_dir'], k, quality)
+
+            src = [os.path.join(video_path, x + ".mp4")
+                   for x in chapter[k]['scene_order']]
+
+            dest = chapter[k]['scene_order']
+            num_scenes = len(dest)
+
+            if seq['configs']['prepend_basename']:
+                dest = [(chapter[k]['basename'] + x) for x in dest]
+
+            titles = dest
+
+            filenums = [scene_number + x for x in range(num_scenes)]
+            dest = [os.path.join(target_folder, f'{x:02}_{y}.mp4')
+                    for x, y in zip(filenums, dest)]
+
+            scene_number += num_scenes
+
+            chapters.append({'name': k, 'basename': chapter[k]['basename'],
+                             'src': src, 'dest': dest, 'titles': titles})
+
+    return chapters
+
+
+def check_scenes(chapters):
+    missing = [x for chapter in chapters for x in chapter['src']
+               if not os.path.exists(x)]
+    if missing:
+        raise FileNotFoundError(
+            'Scenes not rendered at this quality:\n' + '\n'.join(missing))
+
+
+def checksum(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def link_or_copy(src, dest):
+    """
+    Reflinks dest to src where the filesystem supports it, else hardlinks,
+    else copies.
+    """
+    if os.path.lexists(dest):
+        os.remove(dest)
+
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as s, open(dest, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return 'reflink'
+        except OSError:
+            os.remove(dest)
+
+    try:
+        os.link(src, dest)
+        return 'hardlink'
+    except OSError:
+        shutil.copyfile(src, dest)
+        return 'copy'
+
+
+def sync_scene(src, dest, entry):
+    """
+    Links or copies src to dest unless the manifest entry shows that dest
+    already holds the same render. Returns the new manifest entry.
+    """
+    stat = os.stat(src)
+    current = {'src': src, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    if os.path.exists(dest) and entry.get('src') == src:
+        if all(entry.get(k) == v for k, v in current.items()):
+            return entry
+        current['sha256'] = checksum(src)
+        if entry.get('sha256') == current['sha256']:
+            return current
+    else:
+        current['sha256'] = checksum(src)
+
+    print(f'[{link_or_copy(src, dest)}] {src} -> {dest}', flush=True)
+    return current
+
+
+def copy_scenes(chapters, target_folder, processes=0):
+    check_scenes(chapters)
+
+    manifest_file = os.path.join(target_folder, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    pairs = [(x, y) for chapter in chapters
+             for x, y in zip(chapter['src'], chapter['dest'])]
+
+    with ThreadPoolExecutor(max_workers=processes or None) as pool:
+        entries = pool.map(lambda p: sync_scene(*p, manifest.get(p[1], {})),
+                           pairs)
+        manifest = {y: entry for (_, y), entry in zip(pairs, entries)}
+
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def probe_duration(video):
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', video],
+        capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
+
+
+def concat_videos(src, titles, dest):
+    """
+    Joins the videos without re-encoding (ffmpeg concat demuxer, stream
+    copy) with a chapter marker at the start of each of them.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        playlist = os.path.join(tmp, 'playlist.txt')
+        with open(playlist, 'w', encoding='utf-8') as f:
+            for x in src:
+                path = os.path.abspath(x).replace("'", "'\\''")
+                f.write(f"file '{path}'\n")
+
+        metadata = os.path.join(tmp, 'chapters.txt')
+        with open(metadata, 'w', encoding='utf-8') as f:
+            f.write(';FFMETADATA1\n')
+            start = 0
+            for x, title in zip(src, titles):
+                end = start + round(1000 * probe_duration(x))
+                f.write('[CHAPTER]\nTIMEBASE=1/1000\n'
+                        f'START={start}\nEND={end}\ntitle={title}\n')
+                start = end
+
+        subprocess.run(
+            ['ffmpeg', '-y', '-v', 'error',
+             '-f', 'concat', '-safe', '0', '-i', playlist,
+             '-i', metadata, '-map', '0', '-map_metadata', '1',
+             '-map_chapters', '1', '-c', 'copy', '-movflags', '+faststart',
+             dest],
+            check=True)
+
+
+def concat_scenes(chapters, target_folder, deck_name):
+    check_scenes(chapters)
+
+    for i, chapter in enumerate(chapters):
+        concat_videos(chapter['src'], chapter['titles'],
+                      os.path.join(target_folder,
+                                   f"{i:02}_{chapter['basename']}.mp4"))
+
+    concat_videos([x for chapter in chapters for x in chapter['src']],
+                  [x for chapter in chapters for x in chapter['titles']],
+                  os.path.join(target_folder, deck_name + ".mp4"))
+
+
+def make_presentation(seq):
+    target_folder = seq['configs']['target_folder']
+    if not os.path.exists(target_folder):
+        os.makedirs(target_folder)
+
+    chapters = get_chapters(seq)
+
+    if seq['configs'].get('assembly', "copy") == "concat":
+        concat_scenes(chapters, target_folder,
+                      seq['configs'].get('deck_name', "presentation"))
+    else:
+        copy_scenes(chapters, target_folder, seq['configs'].get('processes', 0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Assemble the rendered scenes in sequence.toml")
+    parser.add_argument("--sequence", default="sequence.toml")
+    parser.add_argument("--quality")
+    args = parser.parse_args()
+
+    seq = toml.load(args.sequence)
+    if args.quality:
+        seq['configs']['quality'] = args.quality
+    print(seq)
+    make_presentation(seq)
@@ -1,13 +1,16 @@
 from manim import *
 from jxprmat import CirumscribedJMatrix
-from jxprutils import SceneConfig, make_title, vgroup
+from jxprutils import ProfiledScene, SceneConfig, make_title, vgroup
 from jxprlib import get_terms, get_verb, get_equals
+from jxprsnap import restore_scene
+from jxprconf import load_config
+from jxprtrace import beat
+from jxprrecord import Registry
 from functools import partial
 from box import Box
-import toml
-from beartype import beartype
+from jxprcheck import beartype
 
-DEFAULTS = Box(toml.load("defaults.toml"), box_dots=True, frozen_box=True)
+DEFAULTS = load_config("defaults.toml")
 
 
 SCENE_CONFIG = SceneConfig(
@@ -61,19 +64,21 @@ def make_plusexpr(
 ) -> VGroup:
     colors = DEFAULTS.matrix.color_palette.two_color
     return vgroup(
-        x.set_color(colors.xy).set_opacity(circumshapes=0),
+        x.style({"all": {"color": colors.xy}, "circumshapes": {"opacity": 0}}),
         get_verb("plus"),
-        y.set_color(colors.xy).set_opacity(circumshapes=0),
+        y.style({"all": {"color": colors.xy}, "circumshapes": {"opacity": 0}}),
         get_equals("rightarrow"),
-        x_plus_y.set_color(colors.result).set_opacity(circumshapes=0),
+        x_plus_y.style(
+            {"all": {"color": colors.result}, "circumshapes": {"opacity": 0}}
+        ),
     ).arrange(RIGHT, buff=0.4)
 
 
 Text = partial(Text, font=SCENE_CONFIG.font_sans)
 
 
-class IntroductionScene(Scene):
-    mobs = Box(box_dots=True, default_box=True, default_box_attr=[])
+class IntroductionScene(ProfiledScene):
+    mobs = Registry()
 
     def setup(self):
         self.mobs.intro = (
@@ -115,14 +120,14 @@ class IntroductionScene(Scene):
         self.wait(SCENE_CONFIG.wait_time)
 
 
-class RankXRankYScene(Scene):
+class RankXRankYScene(ProfiledScene):
 
-    mobs = Box(box_dots=True, default_box=True, default_box_attr=[])
+    mobs = Registry()
 
     def init_mobs(self, previous_scene_class, current_scene_obj):
-        self.prev_scene = previous_scene_class()
-        self.prev_scene.setup()
-        self.mobs.toc = self.prev_scene.mobs.toc
+        self.prev_scene = restore_scene(previous_scene_class, topic="PlusDyad")
+        for k in ["toc", "intro", "footnote"]:
+            self.mobs[k] = self.prev_scene.mobs[k]
         self.get_exprs(scene=current_scene_obj.__class__.__name__)
 
     def get_exprs(self, scene):
@@ -141,6 +146,7 @@ class RankXRankYScene(Scene):
 
         self.mobs.expr = [make_plusexpr(**t) for t in terms]
 
+    @beat
     def show_mobj(
         self,
         mobj,
@@ -161,8 +167,8 @@ class RankXRankYScene(Scene):
 
     def update_toc(self, target_row: int = 1):
 
-        intro = IntroductionScene.mobs.intro
-        footnote = IntroductionScene.mobs.footnote
+        intro = self.mobs.intro
+        footnote = self.mobs.footnote
 
         if target_row == 1:
             self.mobs.toc.generate_target()
@@ -233,7 +239,7 @@ class RankNRankNScene(RankXRankYScene):
         self.add(SCENE_CONFIG.title)
         self.show_next_topic(
             focus_row=2,
-            mobj=self.prev_scene.mobs.expr[-1].shift([0, -0.60, 0]),
+            mobj=self.mobs.expr[-1].shift([0, -0.60, 0]),
             descr={"text": "Now consider the second case..."},
         )
         self.show_mobj(
@@ -254,7 +260,7 @@ class RankNRankMScene(RankXRankYScene):
         self.add(SCENE_CONFIG.title)
         self.show_next_topic(
             focus_row=3,
-            mobj=self.prev_scene.mobs.expr[-1],
+            mobj=self.mobs.expr[-1],
             descr={"text": "The last case is the most general...."},
         )
         self.show_mobj(
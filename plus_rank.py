@@ -1,4 +1,3 @@
-from cProfile import run
 from ctypes import alignment
 from dataclasses import replace
 from socket import create_connection
@@ -8,16 +7,20 @@ from toolz.itertoolz import concat
 from typing import Union, Iterable
 from pathlib import Path
 from functools import partial
-from jxprutils import make_title, SceneConfig, vgroup
+from jxprutils import make_title, ProfiledScene, SceneConfig, vgroup
 from jxprlib import get_terms, get_verb, get_equals
 from jxprmgr import JExpressionManager
 from jxprmat import CirumscribedJMatrix
-import toml
+from jxprsnap import restore_scene
+from jxprconf import load_config
+from jxprtrace import beat
+from jxprtimeline import Timeline, push
+from jxprrecord import Registry
 from box import Box
-from beartype import beartype
+from jxprcheck import beartype
 
-LIB = Box(toml.load("lib.toml"), frozen_box=True)
-DEFAULTS = Box(toml.load("defaults.toml"), frozen_box=True)
+LIB = load_config("lib.toml")
+DEFAULTS = load_config("defaults.toml")
 
 SCENE_CONFIG = SceneConfig(
     title=make_title(
@@ -29,8 +32,8 @@ Text = partial(Text, font=SCENE_CONFIG.font_sans)
 empty_box = Box(default_box=True)
 
 # [self.remove(*x) for x in expr.grouped_expr]
-class IntroductionScene(Scene):
-    mobs = Box(default_box=True, default_box_attr=[])
+class IntroductionScene(ProfiledScene):
+    mobs = Registry()
     mobs.descr = Text("Let's examine that last case in more detail...").scale(0.9)
 
     def construct(self):
@@ -39,12 +42,13 @@ class IntroductionScene(Scene):
         self.wait(SCENE_CONFIG.wait_time)
 
 
-class PlusRankScene(Scene):
+class PlusRankScene(ProfiledScene):
 
     CONFIG = {"run_time": 0.1}
 
-    mobs = Box(default_box=True, default_box_attr=[])
+    mobs = Registry()
 
+    @beat
     @beartype
     def show_mobj(
         self,
@@ -96,6 +100,23 @@ class PlusRankScene(Scene):
     def add_title(self, title=SCENE_CONFIG.title):
         self.add(title)
 
+    def timeline(self, *mobjects: Mobject) -> Timeline:
+        return Timeline(self, *mobjects, batch=SCENE_CONFIG.batch_animations)
+
+    @beartype
+    def arrange_expr(self, expr: JExpressionManager, order: list, spec: dict):
+        """
+        Orders and styles expr (see JExpressionManager.style) with a single
+        layout. The scales in spec are applied once it is laid out, so that
+        the scaled subexprs keep their place in it.
+        """
+        scales = {k: props for k, props in spec.items() if "scale" in props}
+        with expr.batch():
+            expr.set_order(order).reorder().style(
+                {k: props for k, props in spec.items() if k not in scales}
+            )
+        return expr.style(scales)
+
 
 class SimplerProblemScene(PlusRankScene):
     def text(self, x):
@@ -103,12 +124,14 @@ class SimplerProblemScene(PlusRankScene):
 
     def setup(self):
 
-        self.mobs.expr = (
-            self.get_expr(verb="plus_rank00")
-            .set_order(["x", "verb", "y"])
-            .reorder()
-            .set_scale(0.9, subexpr=["verb"])
-            .set_opacity(circumshapes=0, subexpr=["x", "y"])
+        self.mobs.expr = self.arrange_expr(
+            self.get_expr(verb="plus_rank00"),
+            ["x", "verb", "y"],
+            {
+                "verb": {"scale": 0.9},
+                ("x", "circumshapes"): {"opacity": 0},
+                ("y", "circumshapes"): {"opacity": 0},
+            },
         )
 
         self.place_expr = lambda x, y: x.grouped_expr.next_to(y, DOWN).shift(DOWN)
@@ -154,32 +177,35 @@ class SimplerProblemScene(PlusRankScene):
 
 
 class Plus00Rank1XRank1YScene(PlusRankScene):
-    mobs = Box(default_box=True, default_box_attr=[])
+    mobs = Registry()
 
     SUBEXPR_COLORS = Box(DEFAULTS.matrix.color_palette.three_color)
 
     def setup_expr(self):
-        self.mobs.expr = (
-            self.get_expr(
-                verb="plus_rank00",
-                equals="downarrow",
-                terms_kwargs={"x_plus_y": {"h_buff": 2.25}},
-            )
-            .set_order(["x", "verb", "y", "equals", "x_plus_y"])
-            .reorder()
-            .set_scale(0.9, subexpr=["verb"])
-            .set_opacity(circumshapes=0, subexpr=["x", "y"])
-            .set_opacity(0, subexpr=["equals", "x_plus_y"])
+        self.mobs.expr = expr = self.get_expr(
+            verb="plus_rank00",
+            equals="downarrow",
+            terms_kwargs={"x_plus_y": {"h_buff": 2.25}},
         )
 
-        self.mobs.expr.set_grouper(
-            lambda j: vgroup(
-                vgroup(j.x, j.verb, j.y).arrange(RIGHT, buff=0.4),
-                j.equals,
+        # Laid out once, by the grouper set last
+        with expr.batch():
+            expr.set_order(["x", "verb", "y", "equals", "x_plus_y"]).reorder().style(
+                {
+                    "verb": {"scale": 0.9},
+                    ("x", "circumshapes"): {"opacity": 0},
+                    ("y", "circumshapes"): {"opacity": 0},
+                    "equals": {"opacity": 0},
+                    "x_plus_y": {"opacity": 0},
+                }
+            ).set_grouper(
+                lambda j: vgroup(
+                    vgroup(j.x, j.verb, j.y).arrange(RIGHT, buff=0.4),
+                    j.equals,
+                )
+                .arrange(DOWN, buff=0.4)
+                .next_to(SCENE_CONFIG.title, 3 * DOWN)
             )
-            .arrange(DOWN, buff=0.4)
-            .next_to(SCENE_CONFIG.title, 3 * DOWN)
-        )
 
         self.mobs.expr.jexpr.x_plus_y.matrix.next_to(
             self.mobs.expr.jexpr.equals, 5 * DOWN
@@ -238,7 +264,7 @@ class Plus00Rank1XRank1YScene(PlusRankScene):
         )
 
     @beartype
-    def move_subexpr_to_target(
+    def subexpr_to_target(
         self,
         item: str,
         index: int,
@@ -260,8 +286,11 @@ class Plus00Rank1XRank1YScene(PlusRankScene):
             center + v_dist * UP + h_buff_scale * h_buff * LEFT
         ).scale(scale)
 
-        self.play(MoveToTarget(subexpr))
+        return subexpr
 
+    def move_subexpr_to_target(self, *args, **kwargs):
+        subexpr = self.subexpr_to_target(*args, **kwargs)
+        self.play(MoveToTarget(subexpr))
         return subexpr
 
     def animate_explanation(self):
@@ -283,18 +312,29 @@ class Plus00Rank1XRank1YScene(PlusRankScene):
         )
 
         set_focus = lambda t, i: expr.jexpr[t].set_focus([i])
-        for i in range(expr.jexpr.x.nitems):
-            self.play(FadeIn(vgroup(set_focus("x", i), set_focus("y", i))))
+
+        def explain_item(tl: Timeline, i: int):
+            tl.play(lambda: FadeIn(vgroup(set_focus("x", i), set_focus("y", i))))
 
             terms = []
             for s, t in enumerate(["x", "verb", "y"]):
-                terms.append(self.move_subexpr_to_target(t, i, h_buff_scale=1.0 - s))
+                tl.play(
+                    lambda s=s, t=t: MoveToTarget(
+                        push(terms, self.subexpr_to_target(t, i, h_buff_scale=1.0 - s))
+                    )
+                )
 
-            self.play(FadeIn(expr.jexpr.x_plus_y.set_opacity(1, indices=[i]).matrix))
-            self.wait(SCENE_CONFIG.wait_time)
+            tl.play(
+                lambda: FadeIn(expr.jexpr.x_plus_y.set_opacity(1, indices=[i]).matrix)
+            )
+            tl.wait(SCENE_CONFIG.wait_time)
 
-            self.play(VGroup(*terms).animate.set_opacity(0.25))
-            expr.jexpr.x_plus_y.set_opacity(0.25, indices=range(i + 1))
+            tl.play(lambda: VGroup(*terms).animate.set_opacity(0.25))
+            tl.call(lambda: expr.jexpr.x_plus_y.set_opacity(0.25, indices=range(i + 1)))
+
+        with self.timeline(vgroup(*expr.jexpr.values())) as tl:
+            for i in range(expr.jexpr.x.nitems):
+                explain_item(tl, i)
 
         self.play(FadeIn(expr.set_opacity(1).grouped_expr))
 
@@ -308,22 +348,37 @@ class Plus00Rank1XRank1YScene(PlusRankScene):
         else:
             start, stop, step = 0, (item.nitems - 1), 1
 
-        for i in range(start, stop, step):
-            item_copy = item.copy()
-            entry = VGroup(item_copy.circumshapes[i], item_copy.matrix_items[i])
-            entry.generate_target()
-            entry.target.set_opacity(1)
-            entry.target.move_to(item.circumshapes[i + step].get_center())
-            self.play(MoveToTarget(entry))
-            item.set_opacity(1, indices=[i + step])
-            self.remove(entry)
-            self.wait(SCENE_CONFIG.wait_time)
+        copies = []  # Hidden as they land, removed once the timeline is played
+
+        def replicate_item(tl: Timeline, i: int):
+            entry = []
+
+            def move_entry():
+                item_copy = item.copy()
+                push(
+                    entry, VGroup(item_copy.circumshapes[i], item_copy.matrix_items[i])
+                )
+                entry[0].generate_target()
+                entry[0].target.set_opacity(1)
+                entry[0].target.move_to(item.circumshapes[i + step].get_center())
+                return MoveToTarget(entry[0])
+
+            tl.play(move_entry)
+            tl.call(lambda: item.set_opacity(1, indices=[i + step]))
+            tl.call(lambda: entry[0].set_opacity(0))
+            copies.append(entry)
+            tl.wait(SCENE_CONFIG.wait_time)
+
+        with self.timeline(item.matrix) as tl:
+            for i in range(start, stop, step):
+                replicate_item(tl, i)
+
+        self.remove(*[mob for entry in copies for mob in entry])
 
 
 class SimplerProblemExplanationScene(Plus00Rank1XRank1YScene):
     def show_explanation(self):
-        prev_scene = SimplerProblemScene()
-        prev_scene.setup()
+        prev_scene = restore_scene(SimplerProblemScene, topic="PlusRank")
 
         expr = self.mobs.expr
         grouper = expr.grouper
@@ -476,7 +531,7 @@ class OperandAgreementAcrossDyadScene(Plus00Rank1XRank1YScene):
 
         self.play(FadeIn(txt))
         self.play(Create(Underline(mobject=txt[8:23], buff=0.2), run_time=2))
-        self.play(
+        self.decorate(
             Circumscribe(
                 txt, fade_out=False, color=GOLD, time_width=1.0, buff=0.4, run_time=3
             )
@@ -500,17 +555,20 @@ class OperandAgreementAcrossDyadScene(Plus00Rank1XRank1YScene):
 
 class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
     def setup_expr(self):
-        self.mobs.expr = (
+        self.mobs.expr = self.arrange_expr(
             self.get_expr(
                 verb="plus_rank10",
                 equals="downarrow",
                 terms_kwargs={"x": {"circumitems": "rows"}},
-            )
-            .set_order(["x", "verb", "y", "equals", "x_plus_y"])
-            .reorder()
-            .set_scale(0.9, subexpr=["verb"])
-            .set_opacity(circumshapes=0, subexpr=["x", "y"])
-            .set_opacity(0, subexpr=["equals", "x_plus_y"])
+            ),
+            ["x", "verb", "y", "equals", "x_plus_y"],
+            {
+                "verb": {"scale": 0.9},
+                ("x", "circumshapes"): {"opacity": 0},
+                ("y", "circumshapes"): {"opacity": 0},
+                "equals": {"opacity": 0},
+                "x_plus_y": {"opacity": 0},
+            },
         )
 
     def setup_result_exprs(self):
@@ -571,7 +629,7 @@ class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
         self.add(expr00.jexpr.equals)
 
     @beartype
-    def move_subexpr_to_target(
+    def subexpr_to_target(
         self,
         y_indices: Iterable[int],
         x00_indices: Iterable[int],
@@ -602,9 +660,12 @@ class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
 
         subexpr.target.become(subexpr00.set_opacity(0.75))
 
+        return subexpr
+
+    def move_subexpr_to_target(self, *args, **kwargs) -> VGroup:
+        subexpr = self.subexpr_to_target(*args, **kwargs)
         self.play(MoveToTarget(subexpr), run_time=2)
         self.wait(SCENE_CONFIG.wait_time)
-
         return subexpr
 
     def animate_explanation(self):
@@ -617,19 +678,44 @@ class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
             run_time=2,
         )
 
-        for i in range(0, 3):
-            row_item_indices = [3 * i + x for x in range(0, 3)]
-            subexpr = self.move_subexpr_to_target(
-                y_indices=[i], x00_indices=row_item_indices, y00_indices=[3 * i]
+        def fade_to_opacity(obj, indices, opacity=0.25):
+            return obj.animate(
+                items=lambda j: j.animate.set_opacity(opacity),
+                circumshapes=lambda j: j.animate.set_opacity(opacity).set_fill(
+                    opacity=0
+                ),
+                indices=indices,
             )
 
-            self.play(
-                FadeOut(subexpr[3], run_time=2),
-                FadeIn(expr00.jexpr.v.matrix[0][i].set_opacity(1), run_time=3),
+        def explain_row(tl: Timeline, i: int):
+            row_item_indices = [3 * i + x for x in range(0, 3)]
+
+            subexpr = []
+            tl.play(
+                lambda: MoveToTarget(
+                    push(
+                        subexpr,
+                        self.subexpr_to_target(
+                            y_indices=[i],
+                            x00_indices=row_item_indices,
+                            y00_indices=[3 * i],
+                        ),
+                    )
+                ),
+                run_time=2,
+            )
+            tl.wait(SCENE_CONFIG.wait_time)
+
+            tl.play(
+                lambda: [
+                    FadeOut(subexpr[0][3], run_time=2),
+                    FadeIn(expr00.jexpr.v.matrix[0][i].set_opacity(1), run_time=3),
+                ],
+                run_time=3,
             )
 
-            self.play(
-                FadeIn(
+            tl.play(
+                lambda: FadeIn(
                     vgroup(
                         expr00.jexpr.x.set_opacity(1, indices=row_item_indices),
                         expr00.jexpr.y.set_opacity(1, indices=row_item_indices),
@@ -638,40 +724,46 @@ class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
             )
 
             if i == 0:
-                self.play(Write(expr00.jexpr.equals.set_opacity(1)))
+                tl.play(lambda: Write(expr00.jexpr.equals.set_opacity(1)))
 
-            self.wait(SCENE_CONFIG.wait_time)
+            tl.wait(SCENE_CONFIG.wait_time)
 
-            self.play(
-                FadeIn(
+            tl.play(
+                lambda: FadeIn(
                     expr.jexpr.x_plus_y.set_opacity(1, indices=row_item_indices).matrix
                 )
             )
-            self.wait(SCENE_CONFIG.wait_time)
+            tl.wait(SCENE_CONFIG.wait_time)
+
+            tl.call(lambda: subexpr[0].set_opacity(0))
+            moved.append(subexpr)
+
+            tl.play(
+                lambda: list(
+                    concat(
+                        [
+                            fade_to_opacity(expr00.jexpr.x, row_item_indices),
+                            fade_to_opacity(expr00.jexpr.v, [i]),
+                            fade_to_opacity(expr00.jexpr.y, row_item_indices),
+                            fade_to_opacity(expr.jexpr.x_plus_y, row_item_indices),
+                        ]
+                    )
+                )
+            )
 
-            self.remove(*[s for s in subexpr])
+            tl.wait(SCENE_CONFIG.wait_time)
 
-            def fade_to_opacity(obj, indices, opacity=0.25):
-                return obj.animate(
-                    items=lambda j: j.animate.set_opacity(opacity),
-                    circumshapes=lambda j: j.animate.set_opacity(opacity).set_fill(
-                        opacity=0
-                    ),
-                    indices=indices,
-                )
+        moved = []  # Hidden once explained, removed once the timeline is played
 
-            self.play(
-                *concat(
-                    [
-                        fade_to_opacity(expr00.jexpr.x, row_item_indices),
-                        fade_to_opacity(expr00.jexpr.v, [i]),
-                        fade_to_opacity(expr00.jexpr.y, row_item_indices),
-                        fade_to_opacity(expr.jexpr.x_plus_y, row_item_indices),
-                    ]
-                )
-            )
+        with self.timeline(
+            expr.jexpr.x_plus_y.matrix,
+            *[expr00.jexpr[j].matrix for j in ["x", "v", "y"]],
+            expr00.jexpr.equals,
+        ) as tl:
+            for i in range(0, 3):
+                explain_row(tl, i)
 
-            self.wait(SCENE_CONFIG.wait_time)
+        self.remove(*[subexpr[0] for subexpr in moved])
 
         self.play(
             *fade_to_opacity(
@@ -683,7 +775,7 @@ class Plus10Rank1XRank1YScene(Plus00Rank1XRank1YScene):
         self.wait(SCENE_CONFIG.wait_time)
 
 
-class QuizScene(Scene):
+class QuizScene(ProfiledScene):
     @beartype
     def add_questioner_image(self, image: Union[str, Path]):
         self.mobs.questioner = (
@@ -753,14 +845,16 @@ class Quiz1Scene(Plus10Rank1XRank1YScene, QuizScene):
 
 class Plus00Rank1XRank2YScene(Plus10Rank1XRank1YScene):
     def setup_original_expr(self, index=0, terms_args={}):
-        self.mobs.original_expr = (
+        self.mobs.original_expr = self.arrange_expr(
             self.get_expr(
                 verb="plus_rank00", terms_index=index, terms_kwargs=terms_args
-            )
-            .set_order(["x", "verb", "y"])
-            .reorder()
-            .set_scale(0.8, subexpr=["verb"])
-            .set_opacity(circumshapes=0, subexpr=["x", "y"])
+            ),
+            ["x", "verb", "y"],
+            {
+                "verb": {"scale": 0.8},
+                ("x", "circumshapes"): {"opacity": 0},
+                ("y", "circumshapes"): {"opacity": 0},
+            },
         )
 
     def setup_expr(
@@ -769,17 +863,19 @@ class Plus00Rank1XRank2YScene(Plus10Rank1XRank1YScene):
         terms_args={"x": {"circumitems": "entries"}, "y": {"circumitems": "entries"}},
         order=["x", "verb", "y", "equals", "x_plus_y"],
     ):
-        self.mobs.expr = (
+        self.mobs.expr = self.arrange_expr(
             self.get_expr(
                 verb="plus_rank00",
                 equals="rightarrow",
                 terms_kwargs=terms_args,
                 terms_index=index,
-            )
-            .set_order(order)
-            .reorder()
-            .set_scale(0.8, subexpr=["verb"])
-            .set_opacity(circumshapes=0, subexpr=["x", "y"])
+            ),
+            order,
+            {
+                "verb": {"scale": 0.8},
+                ("x", "circumshapes"): {"opacity": 0},
+                ("y", "circumshapes"): {"opacity": 0},
+            },
         )
 
 
@@ -1067,7 +1163,7 @@ class Quiz2Scene(Plus00Rank1XRank2YScene, QuizScene):
             creation_animation=Write,
         )
 
-        self.play(*expr.jexpr.x.animate(Wiggle, indices=[9, 10, 11]))
+        self.decorate(*expr.jexpr.x.animate(Wiggle, indices=[9, 10, 11]))
 
         self.wait(SCENE_CONFIG.wait_time)
 
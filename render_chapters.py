@@ -0,0 +1,224 @@
+# Renders every scene in sequence.toml in parallel, then makes the presentation
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List
+
+import toml
+from beartype import beartype
+
+from jxprhash import scene_fingerprint, load_manifest, save_manifest
+from make_presentation import make_presentation
+
+# Quality directory written by manim -> value of its --quality flag
+QUALITY_FLAGS = {
+    "480p15": "l",
+    "720p30": "m",
+    "1080p60": "h",
+    "1440p60": "p",
+    "2160p60": "k",
+}
+
+# Any other "<height>p<fps>" quality, e.g. "240p10", is rendered 16:9
+QUALITY_PATTERN = re.compile(r"^(?P<height>\d+)p(?P<fps>\d+)$")
+
+
+@beartype
+def quality_args(quality: str) -> List[str]:
+    """
+    manim options rendering into the ``quality`` directory.
+    """
+    if quality in QUALITY_FLAGS:
+        return ["--quality", QUALITY_FLAGS[quality]]
+
+    match = QUALITY_PATTERN.match(quality)
+    if match is None:
+        raise ValueError(f"Unsupported quality {quality}")
+
+    height = int(match["height"])
+    width = 2 * round(height * 16 / 9 / 2)
+    return ["--resolution", f"{width},{height}", "--frame_rate", match["fps"]]
+
+
+@dataclass(frozen=True)
+class SceneJob:
+    chapter: str
+    topic: str
+    scene: str
+    quality: str
+    profile: str = ""
+
+    @property
+    def module(self) -> str:
+        return self.chapter + ".py"
+
+    def output(self, base_dir: str) -> str:
+        return os.path.join(base_dir, self.chapter, self.quality, self.scene + ".mp4")
+
+    def manifest(self, base_dir: str) -> str:
+        return os.path.join(base_dir, self.chapter, self.quality, "fingerprints.json")
+
+    def fingerprint(self) -> str:
+        return scene_fingerprint(
+            self.module, self.scene, self.topic, self.quality, self.profile
+        )
+
+    def command(self) -> List[str]:
+        return [
+            sys.executable, "-m", "manim", "render",
+            *quality_args(self.quality),
+            self.module, self.scene,
+        ]
+
+
+@beartype
+def get_jobs(
+    seq: dict, quality: str, chapters: List[str] = [], profile: str = ""
+) -> List[SceneJob]:
+    jobs = []
+    for chapter in seq["chapters"]:
+        for k, v in chapter.items():
+            if chapters and k not in chapters:
+                continue
+            jobs += [
+                SceneJob(k, v["basename"], scene, quality, profile)
+                for scene in v["scene_order"]
+            ]
+
+    return jobs
+
+
+def render_scene(job: SceneJob) -> subprocess.CompletedProcess:
+    """
+    Renders a single scene in its own manim process.
+    """
+    # The profile also decides whether the beartype checks run (see jxprcheck)
+    env = dict(os.environ, JXPR_PROFILE=job.profile) if job.profile else None
+    return subprocess.run(job.command(), capture_output=True, text=True, env=env)
+
+
+@beartype
+def stale_jobs(jobs: List[SceneJob], base_dir: str) -> Dict[SceneJob, str]:
+    """
+    Returns the fingerprint of each job whose output is missing or was
+    rendered from different sources than the current ones.
+    """
+    stale = {}
+    for job in jobs:
+        fingerprint = job.fingerprint()
+        manifest = load_manifest(job.manifest(base_dir))
+        if (
+            manifest.get(job.scene) != fingerprint
+            or not os.path.exists(job.output(base_dir))
+        ):
+            stale[job] = fingerprint
+        else:
+            print(f"[unchanged] {job.chapter}.{job.scene}", flush=True)
+
+    return stale
+
+
+@beartype
+def render_jobs(
+    jobs: Dict[SceneJob, str], base_dir: str, processes: int = 0
+) -> List[SceneJob]:
+    """
+    Fans the jobs out across ``processes`` manim processes (every core if 0),
+    records the fingerprint of each successful render and returns the jobs
+    that failed.
+    """
+    processes = processes or os.cpu_count() or 1
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(render_scene, job): job for job in jobs}
+        for future in as_completed(futures):
+            job, result = futures[future], future.result()
+            status = "ok" if result.returncode == 0 else "FAILED"
+            print(f"[{status}] {job.chapter}.{job.scene}", flush=True)
+            if result.returncode != 0:
+                print(result.stderr, file=sys.stderr)
+                failed.append(job)
+                continue
+
+            manifest = load_manifest(job.manifest(base_dir))
+            manifest[job.scene] = jobs[job]
+            save_manifest(job.manifest(base_dir), manifest)
+
+    return failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Render the scenes in sequence.toml and make the presentation"
+    )
+    parser.add_argument("--sequence", default="sequence.toml")
+    parser.add_argument(
+        "--quality", help="e.g. " + ", ".join(QUALITY_FLAGS) + " or 240p10"
+    )
+    parser.add_argument(
+        "--profile",
+        help="Render profile in defaults.toml, e.g. draft for quick previews",
+    )
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--chapters", nargs="+", default=[])
+    parser.add_argument("--force", action="store_true", help="Re-render every scene")
+    parser.add_argument(
+        "--trace", help="Write timing traces of the rendered scenes to this folder"
+    )
+    parser.add_argument(
+        "--cpu-profile",
+        choices=["cprofile", "sample"],
+        help="Write pstats and collapsed stacks of the rendered scenes",
+    )
+    parser.add_argument("--no-tex-prepass", action="store_true")
+    parser.add_argument("--no-presentation", action="store_true")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    seq = toml.load(args.sequence)
+
+    # Read by jxprtrace and jxprprof in the manim processes
+    if args.trace:
+        os.environ["JXPR_TRACE"] = args.trace
+    if args.cpu_profile:
+        os.environ["JXPR_CPU_PROFILE"] = args.cpu_profile
+
+    defaults = toml.load("defaults.toml")
+    profile = (
+        args.profile or os.environ.get("JXPR_PROFILE") or defaults["scene"]["profile"]
+    )
+
+    configs = seq["configs"]
+    configs["quality"] = (
+        args.quality
+        or defaults["profiles"][profile].get("quality")
+        or configs.get("quality", "480p15")
+    )
+    processes = configs.get("processes", 0) if args.processes is None else args.processes
+
+    jobs = get_jobs(seq, configs["quality"], args.chapters, profile)
+    jobs = (
+        {job: job.fingerprint() for job in jobs}
+        if args.force
+        else stale_jobs(jobs, configs["base_dir"])
+    )
+
+    if jobs and not args.no_tex_prepass:
+        from jxprtex import prepare_tex  # Imports manim
+
+        prepare_tex(sorted({job.module for job in jobs}))
+
+    failed = render_jobs(jobs, configs["base_dir"], processes)
+    if failed:
+        sys.exit(f"{len(failed)} scene(s) failed to render")
+
+    if not args.no_presentation:
+        make_presentation(seq)
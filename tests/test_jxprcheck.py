@@ -0,0 +1,34 @@
+import pytest
+
+from jxprcheck import typecheck_enabled
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.delenv("JXPR_TYPECHECK", raising=False)
+    monkeypatch.delenv("JXPR_PROFILE", raising=False)
+    return monkeypatch
+
+
+def test_checked_by_default(env):
+    assert typecheck_enabled()
+
+
+@pytest.mark.parametrize("profile, expected", [("final", False), ("draft", True)])
+def test_profile(env, profile, expected):
+    env.setenv("JXPR_PROFILE", profile)
+    assert typecheck_enabled() is expected
+
+
+@pytest.mark.parametrize("value, expected", [("0", False), ("1", True), ("no", False)])
+def test_override(env, value, expected):
+    env.setenv("JXPR_PROFILE", "final")
+    env.setenv("JXPR_TYPECHECK", value)
+    assert typecheck_enabled() is expected
+
+
+def test_profile_without_setting(env, tmp_path):
+    defaults = tmp_path / "defaults.toml"
+    defaults.write_text("[profiles.other]\ntime_scale=1.0\n")
+    env.setenv("JXPR_PROFILE", "other")
+    assert typecheck_enabled(str(defaults))
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from jxprcow import cow_copy  # noqa: E402
+
+
+@pytest.fixture
+def pair():
+    original = manim.Square()
+    points = original.points.copy()
+    return original, cow_copy(original), points
+
+
+def test_clone_shares_buffers(pair):
+    original, clone, points = pair
+    assert np.shares_memory(original.points, clone.points)
+    np.testing.assert_array_equal(clone.points, points)
+
+
+def test_shift(pair):
+    original, clone, points = pair
+    clone.shift(manim.RIGHT)
+    np.testing.assert_array_equal(original.points, points)
+    np.testing.assert_allclose(clone.points, points + manim.RIGHT)
+
+
+def test_shift_original(pair):
+    original, clone, points = pair
+    original.shift(manim.UP)
+    np.testing.assert_array_equal(clone.points, points)
+    np.testing.assert_allclose(original.points, points + manim.UP)
+
+
+def test_stretch(pair):
+    original, clone, points = pair
+    clone.stretch(2, 0, about_point=manim.ORIGIN)
+    np.testing.assert_array_equal(original.points, points)
+    np.testing.assert_allclose(clone.points[:, 0], 2 * points[:, 0])
+
+
+def test_fill(pair):
+    original, clone, points = pair
+    clone.points.fill(7)
+    np.testing.assert_array_equal(original.points, points)
+    assert (clone.points == 7).all()
+
+
+def test_copyto(pair):
+    original, clone, points = pair
+    np.copyto(clone.points, 0)
+    np.testing.assert_array_equal(original.points, points)
+    assert (clone.points == 0).all()
+
+
+def test_item_assignment(pair):
+    original, clone, points = pair
+    clone.points[0] = 5
+    np.testing.assert_array_equal(original.points, points)
+    assert (clone.points[0] == 5).all()
+    np.testing.assert_array_equal(clone.points[1:], points[1:])
+
+
+def test_view_inplace(pair):
+    original, clone, points = pair
+    clone.points[:, 0] *= 2
+    np.testing.assert_array_equal(original.points, points)
+    np.testing.assert_allclose(clone.points[:, 0], 2 * points[:, 0])
+    np.testing.assert_array_equal(clone.points[:, 1:], points[:, 1:])
+
+
+def test_view_fill(pair):
+    original, clone, points = pair
+    clone.points[:, 1].fill(3)
+    np.testing.assert_array_equal(original.points, points)
+    assert (clone.points[:, 1] == 3).all()
+
+
+def test_missed_write_fails(pair):
+    original, clone, points = pair
+    with pytest.raises(ValueError):
+        clone.points.view(np.ndarray)[0, 0] = 1
+    np.testing.assert_array_equal(original.points, points)
+
+
+def test_clone_of_group():
+    group = manim.VGroup(manim.Square(), manim.Circle())
+    points = [m.points.copy() for m in group]
+    clone = cow_copy(group)
+    clone[1].shift(manim.LEFT)
+    clone[0].points.fill(1)
+    for mob, p in zip(group, points):
+        np.testing.assert_array_equal(mob.points, p)
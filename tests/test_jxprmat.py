@@ -0,0 +1,216 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim import (  # noqa: E402
+    DOWN,
+    LEFT,
+    ORIGIN,
+    RED,
+    UP,
+    Circle,
+    Dot,
+    MobjectMatrix,
+    Rectangle,
+    Square,
+    Triangle,
+)
+
+from jxprmat import CirumscribedJMatrix, bounds, edges  # noqa: E402
+
+STYLE_ATTRS = ["fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width"]
+
+
+def make_matrix(compact=False):
+    # Entries of different sizes, so that aligning them moves something
+    entries = [
+        [Square(0.5), Circle(radius=0.2), Dot()],
+        [Triangle().scale(0.4), Square(0.3), Circle(radius=0.4)],
+    ]
+    return CirumscribedJMatrix(
+        MobjectMatrix(entries), "get_entries", Rectangle(height=1, width=1), compact
+    )
+
+
+def style_of(mat):
+    return [
+        [np.array(getattr(m, k)) for k in STYLE_ATTRS]
+        for mob in [*mat.matrix_items, *mat.circumshapes]
+        for m in mob.get_family()
+    ]
+
+
+def assert_same_style(a, b):
+    for x, y in zip(style_of(a), style_of(b), strict=True):
+        for u, v in zip(x, y):
+            np.testing.assert_allclose(u, v)
+
+
+def assert_same_points(a, b):
+    for x, y in zip(
+        [*a.matrix_items, *a.circumshapes], [*b.matrix_items, *b.circumshapes]
+    ):
+        np.testing.assert_allclose(x.get_all_points(), y.get_all_points())
+
+
+# select / mask
+
+
+@pytest.mark.parametrize(
+    "indices, expected",
+    [
+        ([4, 1, 1, 3], [1, 3, 4]),
+        ((5, 0), [0, 5]),
+        ({2, 0}, [0, 2]),
+        (range(1, 6, 2), [1, 3, 5]),
+        ([-1, 2, 6, 9], [2]),
+        (np.array([[3], [1]]), [1, 3]),
+        (np.array([True, False, True]), [0, 2]),
+        (None, list(range(6))),
+        ([], list(range(6))),
+        (range(0), list(range(6))),
+    ],
+)
+def test_select(indices, expected):
+    mat = make_matrix()
+    assert mat.select(indices).tolist() == expected
+    assert np.flatnonzero(mat.mask(indices)).tolist() == expected
+
+
+def test_set_property_follows_select():
+    mat, reference = make_matrix(), make_matrix()
+    mat.set_opacity(all=0.4, indices=[4, 1, 1, 9])
+    for i in [1, 4]:
+        reference.matrix_items[i].set_opacity(0.4)
+        reference.circumshapes[i].set_opacity(0.4).set_fill(opacity=0)
+    assert_same_style(mat, reference)
+
+
+# set_focus
+
+
+def full_focus(mat, indices, defocus=0.1):
+    """
+    set_focus before it restyled only the changes.
+    """
+    focus = mat.mask(indices)
+    mat.set_opacity(circumshapes=defocus, items=defocus, indices=np.flatnonzero(~focus))
+    mat.set_opacity(circumshapes=1.0, items=1.0, indices=focus)
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [[0], [1], [1, 2], [5], [0, 5]],
+        [[3], [3], [4], ([0, 1], 0.3), [0, 1]],
+    ],
+)
+def test_focus_deltas_match_full_pass(steps):
+    mat, reference = make_matrix(), make_matrix()
+    for step in steps:
+        indices, defocus = step if isinstance(step, tuple) else (step, 0.1)
+        mat.set_focus(indices, defocus)
+        full_focus(reference, indices, defocus)
+        assert_same_style(mat, reference)
+        assert mat.focused.tolist() == sorted(set(indices))
+        assert all(mat.is_focused(i) == (i in indices) for i in range(mat.nitems))
+
+
+def test_focus_after_restyle():
+    mat, reference = make_matrix(), make_matrix()
+    for m in (mat, reference):
+        m.set_focus([0])
+        m.set_opacity(all=0.5, indices=[1])
+    assert mat.focused is None
+    mat.set_focus([1])
+    full_focus(reference, [1])
+    assert_same_style(mat, reference)
+
+
+# bounds / align
+
+
+@pytest.mark.parametrize("direction", [UP, DOWN, LEFT, ORIGIN, UP + LEFT])
+def test_edges_match_critical_points(direction):
+    mobs = make_matrix().matrix_items
+    expected = [m.get_critical_point(direction) for m in mobs]
+    np.testing.assert_allclose(edges(bounds(mobs), direction), expected)
+
+
+def test_bounds_without_points():
+    np.testing.assert_array_equal(bounds([manim.VGroup()]), np.zeros((1, 2, 3)))
+
+
+def old_align(mat, along):
+    """
+    align before it computed the shifts at once.
+    """
+    rows = mat.matrix.get_columns() if along == "columns" else mat.matrix.get_rows()
+    mi, cs = mat.matrix_items, mat.circumshapes
+    for i, m in enumerate(rows):
+        if along == "columns":
+            cs[i].align_to(cs[0], UP)
+            mi[i].align_to(mi[0], UP)
+        else:
+            for j, _ in enumerate(m):
+                cs[i * len(m) + j].align_to(cs[i * len(m)], DOWN)
+                mi[i * len(m) + j].align_to(mi[i * len(m)], DOWN)
+                if not j:
+                    cs[i * len(m) + j].align_to(cs[0], LEFT)
+                    mi[i * len(m) + j].align_to(mi[0])
+
+
+@pytest.mark.parametrize("along", ["entries", "columns"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_align_matches_old(along, compact):
+    mat, reference = make_matrix(compact), make_matrix(compact)
+    mat.align(along)
+    old_align(reference, along)
+    assert_same_points(mat, reference)
+
+
+def test_align_rows():
+    mat = make_matrix()
+    mat.align("rows")
+    for mobs in (mat.circumshapes, mat.matrix_items):
+        lefts = [mobs[i].get_left()[0] for i in (0, 3)]
+        assert lefts[1] == pytest.approx(lefts[0])
+
+
+# style
+
+
+def test_style_matches_chained_calls():
+    mat, reference = make_matrix(), make_matrix()
+    mat.style(
+        {
+            "all": {"opacity": 0.3},
+            ("items", (0, 2)): {"color": RED},
+            ("circumshapes", (1,)): {"color": RED, "stroke_width": 6},
+        }
+    )
+    reference.set_opacity(all=0.3)
+    reference.set_color(items=RED, indices=[0, 2])
+    reference.set_color(circumshapes=RED, indices=[1])
+    reference.set_stroke(circumshapes=RED, width=6, indices=[1])
+    assert_same_style(mat, reference)
+
+
+def test_style_scale_matches_set_scale():
+    mat, reference = make_matrix(), make_matrix()
+    mat.style({("items", (1, 3)): {"scale": 1.5}})
+    reference.set_scale(items=1.5, indices=[1, 3])
+    assert_same_points(mat, reference)
+
+
+def test_style_specific_keys_win():
+    mat = make_matrix()
+    mat.style({("items", (0,)): {"opacity": 1.0}, "items": {"opacity": 0.2}})
+    opacities = [m.get_fill_opacity() for m in mat.matrix_items]
+    assert opacities == pytest.approx([1.0] + [0.2] * 5)
+
+
+def test_style_unknown_part():
+    with pytest.raises(ValueError):
+        make_matrix().style({"rows": {"opacity": 0.5}})
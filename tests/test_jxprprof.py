@@ -0,0 +1,64 @@
+import pstats
+import time
+
+import pytest
+
+import jxprprof
+from jxprprof import SceneProfiler
+
+
+def busy_nested(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_outer(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class NestedScene:
+    def __init__(self, mode, profile_dir):
+        self.profiler = SceneProfiler(self, mode, profile_dir)
+
+    def setup(self):
+        busy_nested()
+
+    def construct(self):
+        pass
+
+
+class OuterScene:
+    def __init__(self, mode, profile_dir):
+        self.mode, self.profile_dir = mode, profile_dir
+        self.profiler = SceneProfiler(self, mode, profile_dir)
+
+    def setup(self):
+        # As restore_scene does for the scene this one builds on
+        NestedScene(self.mode, self.profile_dir).setup()
+
+    def construct(self):
+        busy_outer()
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_nested_scene_in_outer_profile(mode, tmp_path):
+    scene = OuterScene(mode, str(tmp_path))
+    scene.setup()
+    scene.construct()
+    scene.profiler.close()
+    assert not jxprprof.ACTIVE
+
+    name = f"{__name__}.OuterScene"
+    functions = {f[2] for f in pstats.Stats(str(tmp_path / f"{name}.pstats")).stats}
+    assert {"busy_nested", "busy_outer"} <= functions
+
+    collapsed = (tmp_path / f"{name}.collapsed").read_text()
+    assert "busy_nested" in collapsed and "busy_outer" in collapsed
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        OuterScene("trace", str(tmp_path))
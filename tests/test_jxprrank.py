@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from jxprrank import LengthError, apply_dyad, evaluate, format_atom, parse_array
+
+
+@pytest.mark.parametrize(
+    "atom, expected",
+    [
+        (3, "3"),
+        (-4, "_4"),
+        (2.0, "2"),
+        (-2.5, "_2.5"),
+        (1 / 3, "0.333333"),
+        (-2 / 3, "_0.666667"),
+        (1e6, "1e6"),
+        (1.5e-7, "1.5e_7"),
+        (-1e20, "_1e20"),
+        (np.inf, "_"),
+        (-np.inf, "__"),
+        (-0.0, "0"),
+        (np.float64(0.25), "0.25"),
+    ],
+)
+def test_format_atom(atom, expected):
+    assert format_atom(atom) == expected
+
+
+def test_divide_by_zero():
+    assert evaluate("%", [["1", "0", "_2", "0"]], [["3", "0", "0", "_4"]]) == [
+        ["0.333333", "0", "__", "0"]
+    ]
+
+
+def test_negative_results():
+    assert evaluate("-", [["1", "2"]], [["3", "1"]]) == [["_2", "1"]]
+
+
+def test_parse_array_roundtrip():
+    matrix = [["1", "_2"], ["3", "4"], ["", ""], ["5", "6"], ["7", "_8"]]
+    array = parse_array(matrix)
+    assert array.shape == (2, 2, 2)
+    assert evaluate("+", matrix, [["0"]]) == matrix
+
+
+def test_rank():
+    x, y = np.arange(3), np.arange(6).reshape(2, 3)
+    np.testing.assert_array_equal(apply_dyad(np.add, x, y, (1, 1)), x + y)
+    with pytest.raises(LengthError):
+        apply_dyad(np.add, x, y)
+
+
+def test_not_numeric():
+    assert evaluate("+", [["?"]], [["1"]]) is None
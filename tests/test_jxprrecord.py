@@ -0,0 +1,79 @@
+import copy
+import pickle
+
+import pytest
+from box import Box
+
+from jxprrecord import Record, Registry, merge
+
+DEFAULTS = {
+    "element_to_mobject_config": {"font_size": 60, "color": "#F0AC5F"},
+    "v_buff": 1.45,
+    "h_buff": 1.45,
+    "circumitems": "entries",
+}
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"v_buff": 1.3},
+        {"element_to_mobject_config": {"font_size": 90}},
+        {"element_to_mobject_config": {"font_size": 90, "weight": "BOLD"}, "new": 1},
+        {"circumitems": {"nested": True}},
+        {"element_to_mobject_config": "replaced"},
+    ],
+)
+def test_merge_matches_box_addition(overrides):
+    expected = (Box(DEFAULTS) + Box(overrides)).to_dict()
+    assert merge(DEFAULTS, overrides) == expected
+
+
+def test_merge_leaves_inputs_unchanged():
+    defaults = copy.deepcopy(DEFAULTS)
+    overrides = {"element_to_mobject_config": {"font_size": 90}}
+    merge(defaults, overrides)
+    assert defaults == DEFAULTS
+    assert overrides == {"element_to_mobject_config": {"font_size": 90}}
+
+
+def test_registry_matches_default_box():
+    box = Box(default_box=True, default_box_attr=[])
+    registry = Registry()
+    for mobs in (box, registry):
+        mobs.descr.append("a")
+        mobs.descr.append("b")
+        mobs["expr"].append("c")
+        mobs.toc = "toc"
+    assert registry == box.to_dict()
+    assert registry.missing == [] and "missing" in registry
+
+
+def test_record_attributes():
+    record = Record(x=1)
+    record.y = 2
+    assert (record.x, record["y"]) == (1, 2)
+    del record.x
+    assert "x" not in record
+    with pytest.raises(AttributeError):
+        record.x
+    with pytest.raises(AttributeError):
+        del record.x
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_copy_and_pickle():
+    record = Record(x=[1], y=Record(z=2))
+    for clone in (copy.deepcopy(record), pickle.loads(pickle.dumps(record))):
+        assert clone == record and type(clone) is Record
+        assert clone.x is not record.x
+
+
+def test_registry_pickle():
+    registry = Registry()
+    registry.expr.append(1)
+    clone = pickle.loads(pickle.dumps(registry))
+    assert clone == registry
+    clone.descr.append(2)
+    assert clone.descr == [2]
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from jxprtex import PAGE_ENV, multi_page  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "documentclass, expected",
+    [
+        (r"\documentclass[preview]{standalone}", f"[preview,multi={PAGE_ENV}]"),
+        (r"\documentclass[preview,border=1pt]{standalone}",
+         f"[preview,border=1pt,multi={PAGE_ENV}]"),
+        (r"\documentclass{standalone}", f"[multi={PAGE_ENV}]"),
+    ],
+)
+def test_multi_page_keeps_options(documentclass, expected):
+    assert multi_page(documentclass) == r"\documentclass" + expected + "{standalone}"
+
+
+def test_multi_page_other_class():
+    assert multi_page(r"\documentclass{article}") is None
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim import RIGHT, UP, FadeIn, Scene, Square, tempconfig  # noqa: E402
+
+from jxprtimeline import Timeline, push  # noqa: E402
+
+CONFIG = {
+    "dry_run": True,
+    "disable_caching": True,
+    "frame_rate": 10,
+    "pixel_width": 64,
+    "pixel_height": 36,
+}
+
+
+def record(scene, squares, batch):
+    created = []
+    with Timeline(scene, *squares, batch=batch) as tl:
+        for i, square in enumerate(squares):
+            tl.play(lambda s=square: s.animate.shift(UP), run_time=0.2)
+            tl.call(lambda s=square: s.set_opacity(0.5))
+            tl.wait(0.2)
+        tl.play(lambda: FadeIn(push(created, Square(0.2))), run_time=0.2)
+        tl.play(lambda: created[-1].animate.shift(RIGHT), run_time=0.2)
+    return created
+
+
+@pytest.fixture(params=[True, False], ids=["batch", "direct"])
+def played(request):
+    with tempconfig(CONFIG):
+        scene = Scene()
+        squares = [Square(0.5).shift(i * RIGHT) for i in range(3)]
+        scene.add(*squares)
+        created = record(scene, squares, request.param)
+        yield request.param, scene, squares, created
+
+
+def test_steps_match_direct_plays(played):
+    batch, scene, squares, created = played
+    for i, square in enumerate(squares):
+        np.testing.assert_allclose(square.get_center(), i * RIGHT + UP)
+        assert square.get_fill_opacity() == pytest.approx(0.5)
+    np.testing.assert_allclose(created[0].get_center(), RIGHT)
+    assert scene.renderer.time == pytest.approx(1.6, abs=0.1)  # One frame
+    assert scene.renderer.num_plays == (1 if batch else 8)
+
+
+def test_scene_keeps_only_its_mobjects(played):
+    _, scene, squares, created = played
+    assert scene.mobjects == [*squares, *created]
+
+
+def test_remove_after_commit():
+    with tempconfig(CONFIG):
+        scene = Scene()
+        squares = [Square(0.5) for _ in range(2)]
+        scene.add(*squares)
+        tl = Timeline(scene, *squares)
+        tl.play(lambda: squares[0].animate.shift(UP), run_time=0.2)
+        tl.commit()
+        scene.remove(squares[0])
+        tl.play(lambda: squares[1].animate.shift(UP), run_time=0.2)
+        tl.commit()
+        assert scene.mobjects == [squares[1]]
+        assert not tl.steps
+
+
+def test_groups_hold_their_members():
+    with tempconfig(CONFIG):
+        scene = Scene()
+        squares = [Square(0.5) for _ in range(2)]
+        scene.add(*squares)
+        moving = []
+        with Timeline(scene, manim.VGroup(*squares)) as tl:
+            tl.play(lambda: squares[1].animate.shift(UP), run_time=0.2)
+            tl.call(lambda: moving.extend(scene.moving_mobjects))
+        # Redrawn on every frame although only the other one is animated
+        assert squares[0] in moving
+        assert scene.mobjects == squares
+        np.testing.assert_allclose(squares[1].get_center(), UP)